@@ -0,0 +1,158 @@
+"""
+Strength and training-load analytics over the workout log.
+
+Everything here works on whole columns (NumPy arrays / pandas Series), never
+row by row, so the full history of a long-time user is analysed in a few
+milliseconds:
+
+- ``e1rm``: estimated one-rep max (Epley or Brzycki) for any number of sets;
+- ``weekly_group_volume``: kg lifted per muscle group per ISO week;
+- ``daily_load``, ``acwr`` and ``monotony``: acute:chronic workload ratio and
+  Foster's monotony/strain from daily volume.
+
+``pr_index`` calls ``e1rm`` on every logged set. ``load_status`` answers the
+current ACWR and monotony from the daily rollups, so it stays cheap no matter
+how long the history is.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+import rollups
+
+FORMULAS = ("epley", "brzycki")
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+# ACWR band usually read as the "sweet spot"; above it injury risk rises.
+ACWR_SAFE = (0.8, 1.3)
+
+DAY_NS = 86_400_000_000_000
+
+MUSCLE_GROUPS = {
+    "Bench Press": "Chest", "Incline Bench": "Chest", "Dumbbell Press": "Chest",
+    "Cable Fly": "Chest", "Chest Dip": "Chest",
+    "OHP": "Shoulders", "Lateral Raise": "Shoulders", "Face Pull": "Shoulders",
+    "Pull-Up": "Back", "Barbell Row": "Back", "Cable Row": "Back", "Lat Pulldown": "Back",
+    "Deadlift": "Back",
+    "Squat": "Legs", "Leg Press": "Legs", "Leg Extension": "Legs", "Calf Raise": "Legs",
+    "Romanian Deadlift": "Posterior Chain", "Leg Curl": "Posterior Chain", "Hip Thrust": "Posterior Chain",
+    "Curl": "Arms", "Tricep Pushdown": "Arms",
+    "Plank": "Core", "Ab Wheel": "Core",
+}
+
+
+def e1rm(weight, reps, formula="epley"):
+    """Estimated one-rep max; scalars or arrays of equal length.
+
+    A single rep is its own max. Brzycki is undefined from 37 reps up (NaN).
+    """
+    weight = np.asarray(weight, dtype="float64")
+    reps = np.asarray(reps, dtype="float64")
+    if formula == "epley":
+        est = weight * (1 + reps / 30)
+    elif formula == "brzycki":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            est = np.where(reps < 37, weight * 36 / (37 - reps), np.nan)
+    else:
+        raise ValueError(f"unknown e1RM formula {formula!r}; expected one of {FORMULAS}")
+    return np.where(reps > 1, est, weight)
+
+
+def muscle_group(exercises):
+    return pd.Series(exercises).map(MUSCLE_GROUPS).fillna("Other")
+
+
+def _days(dates):
+    # Whole days since the epoch; arithmetic on these replaces datetime groupbys.
+    return dates.to_numpy(dtype="datetime64[ns]").astype("int64") // DAY_NS
+
+
+def best_e1rm(df, formula="epley"):
+    """One row per exercise: the set with the highest e1RM and its date."""
+    cols = ["exercise", "e1rm", "weight", "reps", "date"]
+    sets = df.dropna(subset=["exercise", "weight", "reps"]) if not df.empty else df
+    if sets.empty:
+        return pd.DataFrame(columns=cols)
+    est = e1rm(sets["weight"].to_numpy(), sets["reps"].to_numpy(), formula)
+    codes, _ = pd.factorize(sets["exercise"])
+    top = np.full(codes.max() + 1, -np.inf)
+    np.maximum.at(top, codes, np.nan_to_num(est, nan=-np.inf))
+    # Rows that reach their exercise's max; on a tie the earliest set wins, as in pr_index.
+    hits = np.flatnonzero(est == top[codes])
+    _, first = np.unique(codes[hits], return_index=True)
+    rows = hits[first]
+    best = sets.iloc[rows][["exercise", "weight", "reps", "date"]].assign(
+        exercise=lambda d: d["exercise"].astype(str), e1rm=est[rows].round(1))
+    return best.sort_values("e1rm", ascending=False)[cols]
+
+
+def weekly_group_volume(df):
+    """kg lifted per ISO week (rows, Monday dates) and muscle group (columns)."""
+    df = df.dropna(subset=["date", "exercise"])
+    if df.empty:
+        return pd.DataFrame()
+    # Map each distinct exercise once, then spread the result over the rows.
+    codes, exercises = pd.factorize(df["exercise"])
+    group_codes, groups = pd.factorize(muscle_group(exercises.astype(str)))
+    row_group = group_codes[codes]
+    # 1970-01-01 was a Thursday, so +3 makes weeks start on Monday.
+    week = (_days(df["date"]) + 3) // 7
+    first = week.min()
+    volume = np.nan_to_num(df["volume"].to_numpy(dtype="float64"))
+    flat = np.bincount((week - first) * len(groups) + row_group, weights=volume,
+                       minlength=(week.max() - first + 1) * len(groups))
+    table = pd.DataFrame(flat.reshape(-1, len(groups)), columns=list(groups),
+                         index=pd.to_datetime((np.arange(first, week.max() + 1) * 7 - 3), unit="D"))
+    table.index.name, table.columns.name = "week", "group"
+    return table[sorted(groups)]
+
+
+def daily_load(df, until=None):
+    """Volume per calendar day, with rest days as zero, through ``until`` (default: last logged day)."""
+    df = df.dropna(subset=["date"])
+    if df.empty:
+        return pd.Series(dtype="float64")
+    days = _days(df["date"])
+    first, last = days.min(), days.max()
+    if until is not None:
+        last = max(last, pd.Timestamp(until).value // DAY_NS)
+    load = np.bincount(days - first, weights=np.nan_to_num(df["volume"].to_numpy(dtype="float64")),
+                       minlength=last - first + 1)
+    return pd.Series(load, index=pd.date_range(pd.Timestamp(first, unit="D"), periods=len(load), freq="D"),
+                     name="volume")
+
+
+def acwr(load, acute=ACUTE_DAYS, chronic=CHRONIC_DAYS):
+    """Rolling acute:chronic workload ratio; NaN until a full chronic window exists."""
+    ratio = load.rolling(acute).mean() / load.rolling(chronic).mean()
+    return ratio.replace([np.inf, -np.inf], np.nan)
+
+
+def monotony(load):
+    """Per-week monotony (mean / std of daily load) and strain (weekly load × monotony)."""
+    weeks = load.resample("W-SUN")
+    mean, std, total = weeks.mean(), weeks.std(ddof=0), weeks.sum()
+    mono = (mean / std).replace([np.inf, -np.inf], np.nan)
+    return pd.DataFrame({"load": total, "monotony": mono, "strain": total * mono})
+
+
+def load_status(user_dir, today=None):
+    """Current ACWR and this week's monotony from the daily rollups (last CHRONIC_DAYS only)."""
+    today = today or date.today()
+    since = (today - timedelta(days=CHRONIC_DAYS - 1)).isoformat()
+    days = rollups.frame(rollups.daily(user_dir, since, today.isoformat()), ["volume"])
+    load = pd.Series(days["volume"].to_numpy(dtype="float64"), index=pd.to_datetime(days.index))
+    load = load.reindex(pd.date_range(since, today, freq="D"), fill_value=0.0)
+    if not load.any():
+        return {"acwr": None, "monotony": None, "acute": 0.0, "chronic": 0.0}
+    week = load.iloc[-ACUTE_DAYS:]
+    acute, chronic, spread = week.mean(), load.mean(), week.std(ddof=0)
+    return {
+        "acwr": round(acute / chronic, 2) if chronic else None,
+        "monotony": round(acute / spread, 2) if spread else None,
+        "acute": float(acute), "chronic": float(chronic),
+    }
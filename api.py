@@ -0,0 +1,147 @@
+"""
+Headless JSON API for logging from a phone or watch without rendering a page.
+
+    uvicorn api:app --host 0.0.0.0 --port 8502
+
+Runs beside the Streamlit app from the same directory, so both share the
+same storage, accounts and session tokens. Sign in once, then send the token
+as ``Authorization: Bearer <token>``:
+
+    POST /api/login              {"email": ..., "password": ...} → {"token", "expires_in"}
+    POST /api/logout             revokes the token
+    POST /api/log/<stream>       one entry, or {"entries": [...]}; workout, body, nutrition, recovery
+    GET  /api/latest             newest value per metric, today's supplements
+    GET  /api/health
+
+Entries go through the importer's validation (the form bounds, missing
+``date`` means today, volume and scores are derived) and are saved with
+``recorder.record``, so every index stays in step with the UI. Storage and
+bcrypt calls block, so they run on Starlette's thread pool. Each pool
+thread keeps its own SQLite connection between requests, and uvicorn keeps
+client connections alive. ``python bench.py api`` load-tests a running
+server.
+"""
+
+import os
+from datetime import date
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import asof
+import auth
+import compliance
+import importer
+import recorder
+import sessions
+import storage
+
+LOG_KEYS = tuple(importer.FIELDS)
+
+# Entries accepted in one request; a whole training session fits easily.
+MAX_ENTRIES = 100
+
+
+async def _body(request):
+    try:
+        return await request.json()
+    except ValueError:
+        raise HTTPException(400, "body must be JSON") from None
+
+
+async def _email(request):
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    # Checking revocation is a database read, so it stays off the event loop too.
+    email = await run_in_threadpool(sessions.validate, token) if scheme.lower() == "bearer" else None
+    if email is None:
+        raise HTTPException(401, "missing, expired or revoked token")
+    return email
+
+
+async def _user_dir(request):
+    user_dir = storage.folder_for(await _email(request))
+    os.makedirs(user_dir, exist_ok=True)
+    return user_dir
+
+
+async def login(request):
+    body = await _body(request)
+    email, password = (body.get("email"), body.get("password")) if isinstance(body, dict) else (None, None)
+    if not isinstance(email, str) or not isinstance(password, str):
+        raise HTTPException(400, "email and password are required")
+    ok, message = await run_in_threadpool(auth.login_user, email, password)
+    if not ok:
+        raise HTTPException(503 if "busy" in message else 401, message)
+    return JSONResponse({"token": sessions.issue(email), "expires_in": sessions.TTL})
+
+
+async def logout(request):
+    await _email(request)
+    await run_in_threadpool(sessions.revoke, request.headers["authorization"].partition(" ")[2])
+    return Response(status_code=204)
+
+
+def _log(user_dir, key, rows):
+    today = date.today().isoformat()
+    entries, errors = [], []
+    for i, row in enumerate(rows):
+        try:
+            entries.append(importer.validate(key, {"date": today, **row} if isinstance(row, dict) else row))
+        except importer.RowError as e:
+            errors.append({"entry": i, "error": str(e)})
+    if errors:
+        # All or nothing: a client retrying a rejected batch must not duplicate the good entries.
+        return None, errors
+    result = recorder.record(user_dir, key, *entries)
+    return {"saved": len(entries), "prs": result["prs"]}, None
+
+
+async def log(request):
+    key = request.path_params["key"]
+    if key not in LOG_KEYS:
+        raise HTTPException(404, f"unknown stream {key!r}; expected one of {', '.join(LOG_KEYS)}")
+    user_dir = await _user_dir(request)
+    body = await _body(request)
+    rows = body["entries"] if isinstance(body, dict) and "entries" in body else [body]
+    if not isinstance(rows, list) or not rows:
+        raise HTTPException(400, "entries must be a non-empty list")
+    if len(rows) > MAX_ENTRIES:
+        raise HTTPException(413, f"at most {MAX_ENTRIES} entries per request")
+    result, errors = await run_in_threadpool(_log, user_dir, key, rows)
+    if errors:
+        return JSONResponse({"errors": errors}, status_code=422)
+    return JSONResponse(result, status_code=201)
+
+
+def _latest(user_dir):
+    out = {key: asof.snapshot(user_dir, key) for key in asof.KEYS}
+    out["supplement"] = compliance.today(user_dir)
+    return out
+
+
+async def latest(request):
+    user_dir = await _user_dir(request)
+    return JSONResponse(await run_in_threadpool(_latest, user_dir))
+
+
+async def health(request):
+    return JSONResponse({"ok": True})
+
+
+async def _error(request, exc):
+    return JSONResponse({"error": exc.detail}, status_code=exc.status_code)
+
+
+app = Starlette(
+    routes=[
+        Route("/api/login", login, methods=["POST"]),
+        Route("/api/logout", logout, methods=["POST"]),
+        Route("/api/log/{key}", log, methods=["POST"]),
+        Route("/api/latest", latest, methods=["GET"]),
+        Route("/api/health", health, methods=["GET"]),
+    ],
+    exception_handlers={HTTPException: _error},
+)
@@ -0,0 +1,129 @@
+"""
+"Latest value as of a date" for the metrics shown on the Dashboard cards.
+
+The last *appended* record is the wrong answer as soon as an older day is
+backfilled, so each metric keeps its values ordered by date:
+
+- ``asof_<key>`` holds, per metric, the two most recent dated values (the
+  latest and the one before it, for deltas) and the years that have data;
+- ``asof_<key>_<year>`` holds, per metric, ``[[date, value], ...]`` sorted by
+  date, one value per day (a later log for the same day replaces it).
+
+Composite scores (``recovery_score``, ``hormone_health_score``) are not kept
+here: they are answered from ``scores`` at the current formula version.
+
+``value`` answers from the head in O(1) when the date is at or after the
+newest one, otherwise by bisecting the year lists in O(log n). Entries are
+folded in on write from ``recorder``; ``rebuild`` recreates everything from
+the logs (``python manage.py rebuild-latest``).
+"""
+
+import bisect
+from datetime import date
+
+import indexes
+import schema
+import scores
+import storage
+
+KEYS = ("body", "nutrition", "recovery", "hormone")
+
+# The most recent values kept per metric in the head document.
+HEAD = 2
+
+
+def metrics(key):
+    return [m for m in schema.SCHEMAS[key] if m != "date"]
+
+
+def marker(key):
+    return f"asof_{key}"
+
+
+def _year_name(key, year):
+    return f"asof_{key}_{year}"
+
+
+def _put(pairs, day, value, head=False):
+    """Insert (day, value) into a date-sorted list, replacing the value on the same day."""
+    i = bisect.bisect_left(pairs, day, key=lambda p: p[0])
+    if i < len(pairs) and pairs[i][0] == day:
+        pairs[i][1] = value
+    else:
+        pairs.insert(i, [day, value])
+    if head and len(pairs) > HEAD:
+        del pairs[:-HEAD]
+
+
+def _apply(docs, user_dir, key, entries, fresh=False):
+    head = docs.setdefault(marker(key), {"years": [], "head": {}})
+    for entry in entries:
+        day = str(entry.get("date", ""))[:10]
+        if not day:
+            continue
+        doc = indexes.year_doc(docs, user_dir, _year_name(key, day[:4]), dict, fresh)
+        for m in metrics(key):
+            if m == scores.COLUMNS.get(key):
+                continue
+            v = entry.get(m)
+            if v is None or v == "":
+                continue
+            _put(doc.setdefault(m, []), day, v)
+            _put(head["head"].setdefault(m, []), day, v, head=True)
+        if int(day[:4]) not in head["years"]:
+            bisect.insort(head["years"], int(day[:4]))
+
+
+def record(user_dir, key, entries, head):
+    """Fold newly logged entries into the date-ordered values."""
+    docs = {marker(key): head}
+    _apply(docs, user_dir, key, entries)
+    indexes.write(user_dir, docs)
+
+
+def rebuild(user_dir, key=None):
+    """Recreate the values of ``key`` (default every stream) from the logs."""
+    with storage.user_lock(user_dir):
+        docs = {}
+        for k in [key] if key else KEYS:
+            _apply(docs, user_dir, k, storage.load(user_dir, k), fresh=True)
+        indexes.write(user_dir, docs)
+    return docs
+
+
+def _head(user_dir, key):
+    return indexes.read(user_dir, marker(key), lambda: rebuild(user_dir, key))
+
+
+def _lookup(user_dir, key, head, metric, as_of, skip):
+    """The ``skip``-th value back from ``as_of`` (0 = latest), as (date, value), or None."""
+    if metric == scores.COLUMNS.get(key):
+        return scores.latest(user_dir, key, date.fromisoformat(as_of), skip)
+    pairs = head["head"].get(metric, [])
+    # Fast path: nothing in the head is after as_of, so its newest entries are the answer.
+    if skip < len(pairs) and pairs[-1][0] <= as_of:
+        return tuple(pairs[-1 - skip])
+    for year in reversed([y for y in head["years"] if y <= int(as_of[:4])]):
+        values = (storage.read_sidecar(user_dir, _year_name(key, year)) or {}).get(metric, [])
+        i = bisect.bisect_right(values, as_of, key=lambda p: p[0])
+        if skip < i:
+            return tuple(values[i - 1 - skip])
+        skip -= i
+    return None
+
+
+def value(user_dir, key, metric, as_of=None):
+    """(date, value) of the newest ``metric`` logged on or before ``as_of`` (ISO date, default today)."""
+    return _lookup(user_dir, key, _head(user_dir, key), metric, as_of or date.today().isoformat(), 0)
+
+
+def previous(user_dir, key, metric, as_of=None):
+    """(date, value) of the reading before the one ``value`` returns, or None."""
+    return _lookup(user_dir, key, _head(user_dir, key), metric, as_of or date.today().isoformat(), 1)
+
+
+def snapshot(user_dir, key, as_of=None):
+    """``{metric: value}`` of every metric's newest reading on or before ``as_of``."""
+    head, as_of = _head(user_dir, key), as_of or date.today().isoformat()
+    found = {m: _lookup(user_dir, key, head, m, as_of, 0) for m in metrics(key)}
+    return {m: v[1] for m, v in found.items() if v is not None}
@@ -1,45 +1,156 @@
 import json
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import bcrypt
+import storage
 
+# Accounts live in the indexed ``users`` table of the SQLite database, whatever
+# backend holds the logs. USER_FILE is the old JSON map, imported on first use.
 USER_FILE = "fitness_data/users.json"
 
+_registry = None
+_cache = {}
+_cache_lock = threading.Lock()
+
+# bcrypt releases the GIL, so a few threads hash in parallel while Streamlit's
+# script threads wait. At most HASH_WORKERS + HASH_QUEUE hashes are in flight;
+# past that, logins are turned away instead of piling up.
+BCRYPT_ROUNDS = int(os.environ.get("FITNESS_BCRYPT_ROUNDS", 12))
+HASH_WORKERS = int(os.environ.get("FITNESS_HASH_WORKERS", os.cpu_count() or 2))
+HASH_QUEUE = int(os.environ.get("FITNESS_HASH_QUEUE", 32))
+
+_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE)
+_latency = {"login": deque(maxlen=1000), "register": deque(maxlen=1000)}
+
+class Busy(Exception):
+    """The hashing queue is full."""
+
 def load_users():
+    # A corrupt file must fail loudly: treating it as empty would lose every account.
     if os.path.exists(USER_FILE):
         with open(USER_FILE, "r") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return {}
+            return json.load(f)
     return {}
 
-def save_users(users):
-    os.makedirs(os.path.dirname(USER_FILE), exist_ok=True)
-    with open(USER_FILE, "w") as f:
-        json.dump(users, f, indent=2)
+def _import_user_file(db):
+    with storage.locked(USER_FILE):
+        if os.path.exists(USER_FILE):
+            for email, record in load_users().items():
+                db.add_user(email, record)
+            os.replace(USER_FILE, USER_FILE + ".migrated")
 
-def hash_password(password):
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+def registry():
+    global _registry
+    if _registry is None:
+        backend = storage.get_backend()
+        db = backend if isinstance(backend, storage.SqliteBackend) else storage.SqliteBackend()
+        _import_user_file(db)
+        _registry = db
+    return _registry
+
+def invalidate(email=None):
+    with _cache_lock:
+        if email is None:
+            _cache.clear()
+        else:
+            _cache.pop(email, None)
+
+def _submit(fn, *args):
+    if not _slots.acquire(blocking=False):
+        raise Busy("too many logins in progress")
+    try:
+        future = _pool.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+def hash_password(password, rounds=None):
+    return _submit(_hash, password, rounds or BCRYPT_ROUNDS).result()
 
 def verify_password(password, hashed):
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    return _submit(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8')).result()
+
+def rounds_of(hashed):
+    # "$2b$12$<salt+hash>"
+    return int(hashed.split("$")[2])
+
+def _rehash(email, password):
+    user = registry().get_user(email)
+    if user and rounds_of(user["password"]) != BCRYPT_ROUNDS:
+        registry().update_user(email, {**user, "password": _hash(password, BCRYPT_ROUNDS)})
+        invalidate(email)
+
+def _timed(op, started):
+    _latency[op].append(time.perf_counter() - started)
+
+def _percentile(ordered, q):
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+
+def latency_stats():
+    """Per-attempt latency of recent logins and registrations, in milliseconds."""
+    stats = {}
+    for op, samples in _latency.items():
+        ordered = sorted(samples)
+        if ordered:
+            stats[op] = {"n": len(ordered), "p50": _percentile(ordered, 0.50), "p99": _percentile(ordered, 0.99)}
+    return stats
+
+def get_user(email):
+    # Only hits are cached: an account registered by another process is found on
+    # its first lookup, and records are only replaced through this module.
+    with _cache_lock:
+        if email in _cache:
+            return _cache[email]
+    user = registry().get_user(email)
+    if user is not None:
+        with _cache_lock:
+            _cache[email] = user
+    return user
 
 def register_user(email, password):
-    users = load_users()
-    if email in users:
+    if get_user(email) is not None:
         return False, "User already exists."
-    
-    users[email] = {
-        "password": hash_password(password)
-    }
-    save_users(users)
+
+    started = time.perf_counter()
+    try:
+        hashed = hash_password(password)
+    except Busy:
+        return False, "Server busy, please try again in a moment."
+    finally:
+        _timed("register", started)
+    # INSERT OR IGNORE: the primary key settles concurrent sign-ups for one email.
+    if not registry().add_user(email, {"password": hashed}):
+        return False, "User already exists."
+    invalidate(email)
     return True, "Registration successful."
 
 def login_user(email, password):
-    users = load_users()
-    if email not in users:
+    user = get_user(email)
+    if user is None:
         return False, "Invalid email or password."
     
-    if verify_password(password, users[email]["password"]):
+    started = time.perf_counter()
+    try:
+        ok = verify_password(password, user["password"])
+    except Busy:
+        return False, "Server busy, please try again in a moment."
+    finally:
+        _timed("login", started)
+    if ok:
+        if rounds_of(user["password"]) != BCRYPT_ROUNDS:
+            # Upgrade the stored hash to the current work factor off the login path.
+            try:
+                _submit(_rehash, email, password)
+            except Busy:
+                pass
         return True, "Login successful."
     return False, "Invalid email or password."
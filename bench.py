@@ -0,0 +1,448 @@
+"""
+Benchmarks for the data paths behind every page, on synthetic histories.
+
+    python bench.py generate [--users 1] [--days 365] [--work bench_work]
+    python bench.py run [--work bench_work] [--reruns 20] [--out bench.json]
+    python bench.py api --email you@example.com --password ... [--clients 32] [--requests 2000]
+    python bench.py compare baseline.json bench.json [--threshold 0.2]
+
+``generate`` writes synthetic users (1 day to 10 years, 1 to 1000 users) into
+``<work>/fitness_data`` in the same layout the app uses. ``run`` changes into
+``<work>`` and builds every derived index first. It times the storage and
+analytics paths directly (writes go to a scratch copy of the user), then renders
+each page headlessly with Streamlit's ``AppTest``, which needs no browser.
+Each case reports p50/p95 latency, peak traced memory and bytes read per
+call or rerun. ``api`` drives a running ``api.py`` server with concurrent
+clients that each reuse their connections, and reports throughput and
+per-endpoint latency. The JSON written by ``run`` and ``api`` can be diffed
+with ``compare`` to catch regressions between versions.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import analytics
+import asof
+import compliance
+import indexes
+import pr_index
+import recorder
+import rollups
+import scores
+import snapshots
+import storage
+import views
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+MAX_USERS = 1000
+MAX_DAYS = 3650
+
+# Exercises per training day, as (name, start weight kg, weekly gain kg).
+PROGRAM = [("Squat", 80, 0.5), ("Bench Press", 60, 0.25), ("Barbell Row", 55, 0.25),
+           ("Deadlift", 100, 0.5), ("OHP", 35, 0.1)]
+TRAINING_WEEKDAYS = {0, 1, 3, 4}
+
+GENERATE_CHUNK = 10000
+
+
+def email(n):
+    return f"bench{n}@example.com"
+
+
+# ─────────────────────────────────────────────
+# SYNTHETIC DATA
+# ─────────────────────────────────────────────
+def history(days, rng):
+    """Yield (stream, entry) for ``days`` days ending today."""
+    start = date.today() - timedelta(days=days - 1)
+    weight = rng.uniform(70, 95)
+    for i in range(days):
+        day = start + timedelta(days=i)
+        d = day.isoformat()
+        if day.weekday() in TRAINING_WEEKDAYS:
+            for ex, base, gain in PROGRAM:
+                w = round(base + gain * i / 7 + rng.uniform(-5, 5), 1)
+                reps = rng.randint(3, 12)
+                yield "workout", {"date": d, "training_day": "Full Body", "exercise": ex, "sets": 3,
+                                  "reps": reps, "weight": w, "volume": round(3 * reps * w, 1), "notes": ""}
+        weight += rng.uniform(-0.3, 0.28)
+        if i % 2 == 0:
+            bf = rng.uniform(12, 22)
+            yield "body", {"date": d, "bodyweight": round(weight, 1), "bodyfat_pct": round(bf, 1),
+                           "waist": round(rng.uniform(78, 92), 1), "chest": 100.0, "arms": 38.0, "hips": 95.0,
+                           "lean_mass": round(weight * (1 - bf / 100), 1), "notes": ""}
+        p, c, f = rng.randint(120, 200), rng.randint(150, 350), rng.randint(50, 90)
+        yield "nutrition", {"date": d, "calories": rng.randint(1800, 3200), "protein": p, "carbs": c, "fats": f,
+                            "water_l": round(rng.uniform(2, 4), 1), "fiber": rng.randint(15, 40),
+                            "est_calories_from_macros": p * 4 + c * 4 + f * 9, "notes": ""}
+        sleep, stress, energy, rhr = round(rng.uniform(5, 9), 1), rng.randint(1, 5), rng.randint(1, 5), rng.randint(48, 70)
+        yield "recovery", {"date": d, "sleep_hours": sleep, "stress_level": stress, "energy_level": energy,
+                           "resting_hr": rhr, "recovery_score": scores.recovery(sleep, stress, energy, rhr),
+                           "notes": ""}
+        yield "supplement", {"date": d, "notes": "",
+                             **{k: rng.random() < 0.85 for k, _ in compliance.DEFAULTS}}
+        sun, steps, alcohol = rng.randint(0, 90), rng.randint(3000, 15000), rng.choice(list(scores.ALCOHOL_POINTS))
+        training = "Yes – Moderate" if day.weekday() in TRAINING_WEEKDAYS else "No – Rest"
+        quality, drive = rng.randint(1, 5), rng.randint(1, 5)
+        yield "hormone", {"date": d, "sunlight_min": sun, "daily_steps": steps, "alcohol": alcohol,
+                          "training_status": training, "sleep_quality": quality, "energy_libido": drive,
+                          "hormone_health_score": scores.hormone(sun, steps, alcohol, training, quality, drive)}
+
+
+def generate(args):
+    """Write synthetic users into <work>/fitness_data; ``run`` builds their derived indexes."""
+    if not 1 <= args.users <= MAX_USERS or not 1 <= args.days <= MAX_DAYS:
+        sys.exit(f"--users must be 1..{MAX_USERS} and --days 1..{MAX_DAYS}")
+    os.makedirs(args.work, exist_ok=True)
+    os.chdir(args.work)
+    for n in range(args.users):
+        path = storage.folder_for(email(n))
+        if os.path.exists(path):
+            sys.exit(f"{path} already exists; use a fresh --work directory")
+        os.makedirs(path)
+        rng = random.Random(args.seed * MAX_USERS + n)
+        batches = {key: [] for key in storage.STREAMS}
+        rows = 0
+        for key, entry in history(args.days, rng):
+            batch = batches[key]
+            batch.append(entry)
+            if len(batch) >= GENERATE_CHUNK:
+                storage.append(path, key, *batch)
+                rows += len(batch)
+                batch.clear()
+        for key, batch in batches.items():
+            if batch:
+                storage.append(path, key, *batch)
+                rows += len(batch)
+        print(f"{os.path.basename(path)}: {rows:,} entries over {args.days} days")
+    with open("bench_config.json", "w") as f:
+        json.dump({"users": args.users, "days": args.days, "seed": args.seed,
+                   "backend": os.environ.get("FITNESS_STORAGE", "jsonl")}, f)
+
+
+# ─────────────────────────────────────────────
+# MEASUREMENT
+# ─────────────────────────────────────────────
+def _read_bytes():
+    # rchar counts bytes returned by read() calls, page cache hits included.
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _percentile(ordered, q):
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+
+def measure(fn, reruns):
+    """Time ``fn`` ``reruns`` times, then trace one more call for peak memory."""
+    durations, reads = [], []
+    for _ in range(reruns):
+        before = _read_bytes()
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+        if before is not None:
+            reads.append(_read_bytes() - before)
+    # tracemalloc slows allocation down, so it is kept out of the timed calls.
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    ordered = sorted(durations)
+    return {
+        "n": reruns, "p50_ms": _percentile(ordered, 0.50), "p95_ms": _percentile(ordered, 0.95),
+        "peak_kb": peak // 1024, "read_bytes": sum(reads) // len(reads) if reads else None,
+    }
+
+
+def _cold(fn):
+    started = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def build_indexes(path):
+    """Build every derived index, so reads and writes are timed as they run once a user is warm."""
+    pr_index.rebuild(path)
+    for index in indexes.INDEXES.values():
+        index.rebuild(path)
+
+
+def scratch_copy(path):
+    """A copy of a user's streams, with indexes built, that the write cases can append to.
+
+    Copied through ``storage`` so it works for every backend; the benchmark user stays untouched.
+    """
+    scratch = f"{path}_scratch"
+    shutil.rmtree(scratch, ignore_errors=True)
+    os.makedirs(scratch)
+    for key in storage.STREAMS:
+        # Another run copying into the same scratch user fails here rather than mixing the two.
+        seen = storage.version(scratch, key)
+        storage.save(scratch, key, storage.load(path, key), expect=seen)
+    build_indexes(scratch)
+    return scratch
+
+
+def drop_scratch(scratch):
+    for key in storage.STREAMS:
+        storage.save(scratch, key, [])
+    shutil.rmtree(scratch, ignore_errors=True)
+
+
+def data_cases(path, scratch):
+    """Direct calls into the storage, index and analytics layers, keyed by case name.
+
+    Write cases log to ``scratch`` (see ``scratch_copy``), never to ``path``.
+    """
+    cases = {f"load.{key}": (lambda key=key: storage.load(path, key)) for key in storage.STREAMS}
+    if snapshots.available():
+        cases["snapshot.workout"] = lambda: snapshots.frame(path, "workout")
+    day = date.today().isoformat()
+    cases.update({
+        "record.workout_set": lambda: recorder.record(scratch, "workout", {
+            "date": day, "training_day": "Full Body", "exercise": "Squat", "sets": 1,
+            "reps": 5, "weight": 100.0, "volume": 500.0, "notes": "bench"}),
+        "record.recovery": lambda: recorder.record(scratch, "recovery", {
+            "date": day, "sleep_hours": 7.5, "stress_level": 2, "energy_level": 4, "resting_hr": 58,
+            "recovery_score": scores.recovery(7.5, 2, 4, 58), "notes": "bench"}),
+        "pr_index.load": lambda: pr_index.load(path),
+        "rollups.weekly": lambda: rollups.weekly(path),
+        "dashboard.latest": lambda: [asof.snapshot(path, key) for key in asof.KEYS],
+        "dashboard.supplements_today": lambda: compliance.today(path),
+        "supplements.window_365d": lambda: compliance.window(path, date.today() - timedelta(days=364)),
+        "analytics.load_status": lambda: analytics.load_status(path),
+        "scores.recovery_365d": lambda: scores.daily(path, "recovery", date.today() - timedelta(days=364)),
+    })
+    if snapshots.available():
+        def full_analytics():
+            df = snapshots.frame(path, "workout")
+            analytics.best_e1rm(df)
+            analytics.weekly_group_volume(df)
+            analytics.acwr(analytics.daily_load(df))
+        cases["analytics.full_history"] = full_analytics
+    return cases
+
+
+def page_cases(n, timeout):
+    """One AppTest session per page, logged in as synthetic user ``n``."""
+    from streamlit.testing.v1 import AppTest
+
+    import figures
+
+    # Start each user with an empty figure cache so their first rerun is really cold.
+    figures.clear()
+    cases = {}
+    for page in views.PAGES:
+        at = AppTest.from_file(APP, default_timeout=timeout)
+        at.session_state["authenticated"] = True
+        at.session_state["user_email"] = email(n)
+        at.session_state["page"] = page
+
+        def rerun(at=at, page=page):
+            at.run()
+            if at.exception:
+                raise RuntimeError(f"{page}: {at.exception[0].message}")
+        cases[f"page.{views.PAGES[page].split('.')[-1]}"] = rerun
+    return cases
+
+
+def _git_version():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              cwd=os.path.dirname(APP), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    """Time every case for the sampled users and write the results as JSON."""
+    out = os.path.abspath(args.out)
+    os.chdir(args.work)
+    with open("bench_config.json") as f:
+        config = json.load(f)
+    users = range(min(args.sample, config["users"]))
+    results = {}
+    for n in users:
+        path = storage.folder_for(email(n))
+        build_indexes(path)
+        scratch = scratch_copy(path)
+        try:
+            groups = [data_cases(path, scratch)]
+            if not args.no_pages:
+                groups.append(page_cases(n, args.timeout))
+            for cases in groups:
+                for name, fn in cases.items():
+                    # The first call fills snapshots and caches; the indexes are already built.
+                    cold = _cold(fn)
+                    stats = measure(fn, args.reruns)
+                    results.setdefault(name, []).append({"cold_ms": cold, **stats})
+                    print(f"user {n} {name:32} cold {cold:9.2f} ms · p50 {stats['p50_ms']:8.2f} ms · "
+                          f"p95 {stats['p95_ms']:8.2f} ms · peak {stats['peak_kb']:,} KB")
+        finally:
+            drop_scratch(scratch)
+    # Several sampled users: report each case's worst user.
+    summary = {name: max(rows, key=lambda r: r["p95_ms"]) for name, rows in results.items()}
+    report = {
+        "version": _git_version(), "python": platform.python_version(), "platform": platform.platform(),
+        "at": time.strftime("%Y-%m-%dT%H:%M:%S"), "config": config, "reruns": args.reruns,
+        "sampled_users": len(users), "results": summary,
+    }
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {out}")
+
+
+# Share of API requests per operation, roughly a logging session between sets.
+API_MIX = [("log_set", 0.6), ("log_nutrition", 0.1), ("log_recovery", 0.1), ("latest", 0.2)]
+
+
+def _api_request(op, rng):
+    if op == "log_set":
+        reps, weight = rng.randint(3, 12), round(rng.uniform(40, 140), 1)
+        return "POST", "/api/log/workout", {"exercise": rng.choice(PROGRAM)[0], "sets": 1, "reps": reps,
+                                            "weight": weight, "training_day": "Full Body"}
+    if op == "log_nutrition":
+        return "POST", "/api/log/nutrition", {"calories": rng.randint(300, 900), "protein": rng.randint(10, 60)}
+    if op == "log_recovery":
+        return "POST", "/api/log/recovery", {"sleep_hours": 7.5, "stress_level": 2, "energy_level": 4,
+                                             "resting_hr": 58}
+    return "GET", "/api/latest", None
+
+
+async def _api_load(args):
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        r = await client.post("/api/login", json={"email": args.email, "password": args.password})
+        if r.status_code != 200:
+            sys.exit(f"login failed: {r.status_code} {r.text}")
+        headers = {"Authorization": f"Bearer {r.json()['token']}"}
+        ops, weights = zip(*API_MIX)
+        durations = {op: [] for op in ops}
+        errors = {op: 0 for op in ops}
+        remaining = iter(range(args.requests))
+
+        async def worker(n):
+            rng = random.Random(args.seed * MAX_USERS + n)
+            for _ in remaining:
+                op = rng.choices(ops, weights)[0]
+                method, path, body = _api_request(op, rng)
+                started = time.perf_counter()
+                r = await client.request(method, path, json=body, headers=headers)
+                durations[op].append(time.perf_counter() - started)
+                errors[op] += r.status_code >= 400
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(args.clients)))
+        elapsed = time.perf_counter() - started
+    results = {}
+    for op in ops:
+        ordered = sorted(durations[op])
+        if ordered:
+            results[f"api.{op}"] = {"n": len(ordered), "p50_ms": _percentile(ordered, 0.50),
+                                    "p95_ms": _percentile(ordered, 0.95), "errors": errors[op]}
+    return results, elapsed
+
+
+def api(args):
+    """Load-test a running API server and write the results as JSON."""
+    results, elapsed = asyncio.run(_api_load(args))
+    for name, r in results.items():
+        print(f"{name:20} n {r['n']:6,} · p50 {r['p50_ms']:8.2f} ms · p95 {r['p95_ms']:8.2f} ms · "
+              f"errors {r['errors']}")
+    throughput = round(args.requests / elapsed, 1)
+    print(f"{args.requests:,} requests from {args.clients} clients in {elapsed:.2f} s · {throughput:,} req/s")
+    report = {
+        "version": _git_version(), "python": platform.python_version(), "platform": platform.platform(),
+        "at": time.strftime("%Y-%m-%dT%H:%M:%S"), "url": args.url, "clients": args.clients,
+        "requests": args.requests, "throughput_rps": throughput, "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.out}")
+
+
+def compare(args):
+    """Print cases whose p95 grew by more than --threshold; exit 1 if any did."""
+    with open(args.baseline) as f:
+        old = json.load(f)["results"]
+    with open(args.current) as f:
+        new = json.load(f)["results"]
+    regressed = False
+    for name in sorted(set(old) | set(new)):
+        if name not in old or name not in new:
+            print(f"     {name}: only in {'current' if name in new else 'baseline'}")
+            continue
+        a, b = old[name]["p95_ms"], new[name]["p95_ms"]
+        change = (b - a) / a if a else 0.0
+        worse = change > args.threshold
+        regressed |= worse
+        print(f"{'SLOW' if worse else 'ok  '} {name}: p95 {a:.2f} → {b:.2f} ms ({change:+.0%})")
+    if regressed:
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("generate", help="write synthetic users in the fitness_data layout")
+    p.add_argument("--work", default="bench_work", help="directory to create fitness_data in")
+    p.add_argument("--users", type=int, default=1, help=f"1..{MAX_USERS}")
+    p.add_argument("--days", type=int, default=365, help=f"history length, 1..{MAX_DAYS}")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=generate)
+
+    p = sub.add_parser("run", help="time data paths and page reruns")
+    p.add_argument("--work", default="bench_work")
+    p.add_argument("--reruns", type=int, default=20, help="timed calls per case")
+    p.add_argument("--sample", type=int, default=3, help="users to time (the first N)")
+    p.add_argument("--timeout", type=float, default=120, help="seconds allowed per page rerun")
+    p.add_argument("--no-pages", action="store_true", help="skip the AppTest page reruns")
+    p.add_argument("--out", default="bench.json")
+    p.set_defaults(func=run)
+
+    p = sub.add_parser("api", help="load-test a running api.py server")
+    p.add_argument("--url", default="http://127.0.0.1:8502")
+    p.add_argument("--email", required=True, help="an existing account to log in as")
+    p.add_argument("--password", required=True)
+    p.add_argument("--clients", type=int, default=32, help="concurrent clients")
+    p.add_argument("--requests", type=int, default=2000, help="requests across all clients")
+    p.add_argument("--timeout", type=float, default=30, help="seconds allowed per request")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default="bench_api.json")
+    p.set_defaults(func=api)
+
+    p = sub.add_parser("compare", help="diff two result files")
+    p.add_argument("baseline")
+    p.add_argument("current")
+    p.add_argument("--threshold", type=float, default=0.2, help="allowed p95 growth (0.2 = 20%%)")
+    p.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Supplement compliance as one bitmask per day.
+
+Each supplement owns a bit (its position in the user's list, which only ever
+grows, so old days keep their meaning when the list changes). Logged days are
+kept in ``supplement_days_<year>`` sidecars holding two lists of 366 ints
+indexed by day of year: ``taken``, -1 where nothing was logged, and
+``tracked``, the supplements on the checklist that day (the ones the entry
+has a value for). A later log for the same day replaces both masks.
+
+``today`` is a single list lookup. ``window`` returns both masks for any date
+range as int64 arrays, and ``daily`` / ``per_supplement`` turn them into
+percentages with popcounts and shifts over the whole array at once. A day is
+scored only against what was tracked on it, so adding or removing a
+supplement never changes past percentages.
+
+The supplement stream stays the source of truth; ``rebuild`` recreates the
+bitmasks from it. ``record`` is called on every write from ``recorder``.
+"""
+
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import indexes
+import storage
+
+KEYS = ("supplement",)
+
+LIST_SIDECAR = "supplement_list"
+YEARS_SIDECAR = "supplement_day_years"
+
+DEFAULTS = [
+    ("creatine", "🔵 Creatine"), ("vitamin_d", "☀️ Vitamin D"), ("omega_3", "🐟 Omega 3"),
+    ("magnesium", "🌙 Magnesium"), ("zinc", "⚡ Zinc"),
+]
+
+# Bits available in an int64 mask (the sign bit is left for "not logged").
+MAX_SUPPLEMENTS = 63
+
+NOT_LOGGED = -1
+
+
+def supplements(user_dir):
+    """Every supplement the user has tracked, in bit order: ``[{key, label, active}]``."""
+    doc = storage.read_sidecar(user_dir, LIST_SIDECAR)
+    if doc is None:
+        return [{"key": k, "label": label, "active": True} for k, label in DEFAULTS]
+    return doc["supplements"]
+
+
+def active(user_dir):
+    return [s for s in supplements(user_dir) if s["active"]]
+
+
+def _save_list(user_dir, items):
+    storage.write_sidecar(user_dir, LIST_SIDECAR, {"supplements": items})
+
+
+def add(user_dir, label):
+    """Start tracking a supplement; returns its key. Re-adding a removed one reactivates it."""
+    key = re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_")
+    if not key:
+        raise ValueError("supplement name needs a letter or digit")
+    with storage.user_lock(user_dir):
+        items = supplements(user_dir)
+        for s in items:
+            if s["key"] == key:
+                s["active"] = True
+                break
+        else:
+            if len(items) >= MAX_SUPPLEMENTS:
+                raise ValueError(f"at most {MAX_SUPPLEMENTS} supplements can be tracked")
+            items.append({"key": key, "label": f"💊 {label.strip()}", "active": True})
+        _save_list(user_dir, items)
+    return key
+
+
+def remove(user_dir, key):
+    """Stop offering a supplement. Its bit and history are kept."""
+    with storage.user_lock(user_dir):
+        items = supplements(user_dir)
+        for s in items:
+            if s["key"] == key:
+                s["active"] = False
+        _save_list(user_dir, items)
+
+
+def mask(entry, items):
+    """(taken, tracked) bitmasks of one supplement entry."""
+    taken = tracked = 0
+    for i, s in enumerate(items):
+        if s["key"] in entry:
+            tracked |= 1 << i
+            if entry[s["key"]] in (True, 1, "true", "True"):
+                taken |= 1 << i
+    return taken, tracked
+
+
+def _doc_name(year):
+    return f"supplement_days_{year}"
+
+
+def _empty_year():
+    return {"taken": [NOT_LOGGED] * indexes.DAY_SLOTS, "tracked": [0] * indexes.DAY_SLOTS}
+
+
+def _apply(docs, user_dir, entries, items, fresh=False):
+    for entry in entries:
+        if not entry.get("date"):
+            continue
+        d = date.fromisoformat(str(entry["date"])[:10])
+        doc = indexes.year_doc(docs, user_dir, _doc_name(d.year), _empty_year, fresh)
+        doc["taken"][indexes.slot(d)], doc["tracked"][indexes.slot(d)] = mask(entry, items)
+
+
+def marker(key):
+    return YEARS_SIDECAR
+
+
+def record(user_dir, key, entries, head):
+    """Set the day masks of newly logged supplement entries."""
+    docs = {}
+    _apply(docs, user_dir, entries, supplements(user_dir))
+    docs[YEARS_SIDECAR] = indexes.years(docs, head)
+    indexes.write(user_dir, docs)
+
+
+def rebuild(user_dir, key=None):
+    """Recreate every year's masks from the supplement log."""
+    with storage.user_lock(user_dir):
+        docs = {}
+        _apply(docs, user_dir, storage.load(user_dir, "supplement"), supplements(user_dir), fresh=True)
+        docs[YEARS_SIDECAR] = indexes.years(docs)
+        indexes.write(user_dir, docs)
+    return docs
+
+
+def _year(user_dir, year):
+    return indexes.read(user_dir, YEARS_SIDECAR, lambda: rebuild(user_dir), _doc_name(year))
+
+
+def today(user_dir, day=None):
+    """``{key: taken}`` for the active supplements on ``day`` (default today), or None if not logged."""
+    day = day or date.today()
+    doc = _year(user_dir, day.year)
+    bits = doc["taken"][indexes.slot(day)] if doc else NOT_LOGGED
+    if bits == NOT_LOGGED:
+        return None
+    return {s["key"]: bool(bits >> i & 1) for i, s in enumerate(supplements(user_dir)) if s["active"]}
+
+
+def window(user_dir, since, until=None):
+    """(dates, taken, tracked) for every day from ``since`` to ``until``.
+
+    Unlogged days hold NOT_LOGGED in ``taken`` and 0 in ``tracked``.
+    """
+    until = until or date.today()
+    docs = {year: _year(user_dir, year) or _empty_year() for year in range(since.year, until.year + 1)}
+    taken = indexes.window(since, until, lambda year, days: docs[year]["taken"][:days])
+    tracked = indexes.window(since, until, lambda year, days: docs[year]["tracked"][:days])
+    return pd.date_range(since, until, freq="D"), taken.astype("int64"), tracked.astype("int64")
+
+
+def _popcount(masks):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks)
+    return sum((masks >> i) & 1 for i in range(MAX_SUPPLEMENTS))
+
+
+def daily(taken, tracked):
+    """Percent of the supplements tracked each day that were taken; NaN on days nothing was logged."""
+    n = _popcount(tracked)
+    logged = (taken != NOT_LOGGED) & (n > 0)
+    pct = np.full(len(taken), np.nan)
+    pct[logged] = _popcount(taken[logged] & tracked[logged]) / n[logged] * 100
+    return pct
+
+
+def per_supplement(taken, tracked, items):
+    """``{label: percent taken}`` for the active supplements, over the days each was tracked."""
+    logged = taken != NOT_LOGGED
+    bits = np.array([i for i, s in enumerate(items) if s["active"]], dtype="int64")
+    on = (tracked[logged, None] >> bits) & 1
+    days = on.sum(axis=0)
+    hits = ((taken[logged, None] >> bits) & on).sum(axis=0)
+    return {items[i]["label"]: float(h / n * 100) for i, h, n in zip(bits, hits, days) if n}
@@ -0,0 +1,123 @@
+"""
+Session-aware access to the signed-in user's data streams.
+
+Pages go through these helpers rather than ``storage`` directly: they resolve
+the user's folder from the Streamlit session, keep the per-session DataFrame
+cache and invalidate it on every write.
+"""
+
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+import importer
+import pr_index as _pr_index
+import recorder
+import schema
+import snapshots
+import storage
+
+DATA_DIR = storage.DATA_DIR
+os.makedirs(DATA_DIR, exist_ok=True)
+
+def get_user_dir():
+    if "authenticated" in st.session_state and st.session_state.authenticated:
+        user_dir = storage.folder_for(st.session_state.user_email)
+        os.makedirs(user_dir, exist_ok=True)
+        return user_dir
+    return None
+
+def load(key):
+    user_dir = get_user_dir()
+    return storage.load(user_dir, key) if user_dir else []
+
+
+def query(key, since=None, until=None, exercise=None):
+    user_dir = get_user_dir()
+    return storage.query(user_dir, key, since, until, exercise) if user_dir else []
+
+
+def days_ago(n):
+    return (date.today() - timedelta(days=n)).isoformat()
+
+
+def append(key, *entries):
+    user_dir = get_user_dir()
+    if not user_dir:
+        return {"prs": []}
+    result = recorder.record(user_dir, key, *entries)
+    invalidate(key)
+    if key in recorder.PR_KEYS:
+        invalidate("pr")
+    return result
+
+
+def import_file(key, f, fmt, progress=None):
+    user_dir = get_user_dir()
+    if not user_dir:
+        return None
+    report = importer.run(user_dir, key, f, fmt, progress=progress)
+    invalidate(key)
+    if key in recorder.PR_KEYS:
+        invalidate("pr")
+    return report
+
+
+def pr_index():
+    user_dir = get_user_dir()
+    return _pr_index.load(user_dir) if user_dir else _pr_index.empty()
+
+
+# ─────────────────────────────────────────────
+# DATAFRAME CACHE  (per session, survives reruns)
+# ─────────────────────────────────────────────
+def _df_cache():
+    if "df_cache" not in st.session_state:
+        st.session_state.df_cache = {}
+        st.session_state.df_cache_stats = {"hits": 0, "misses": 0}
+    return st.session_state.df_cache
+
+
+def invalidate(key):
+    cache = _df_cache()
+    for k in [k for k in cache if k[1] == key]:
+        del cache[k]
+
+
+def cache_stats():
+    _df_cache()
+    return dict(st.session_state.df_cache_stats)
+
+
+def _frame(records, columns=None):
+    if not columns:
+        return pd.DataFrame(records)
+    # Build only the requested columns; drop the ones this user never logged.
+    return pd.DataFrame.from_records(records, columns=columns).dropna(axis=1, how="all")
+
+
+def to_df(key, columns=None, **filters):
+    user_dir = get_user_dir()
+    if not user_dir:
+        return pd.DataFrame()
+    cache, stats = _df_cache(), st.session_state.df_cache_stats
+    cache_key = (user_dir, key, tuple(columns or ()), tuple(sorted(filters.items())))
+    # The version is a stat (or one primary-key lookup for SQLite), so hits read no entries.
+    version = storage.version(user_dir, key)
+    hit = cache.get(cache_key)
+    if hit and hit[0] == version:
+        stats["hits"] += 1
+        return hit[1].copy()
+    stats["misses"] += 1
+    # Unfiltered cold loads come from the columnar snapshot when there is one.
+    df = None if filters else snapshots.frame(user_dir, key)
+    if df is not None:
+        if columns:
+            df = df[[c for c in columns if c in df.columns]].dropna(axis=1, how="all")
+    else:
+        data = query(key, **filters) if filters else load(key)
+        df = schema.coerce(key, _frame(data, columns)) if data else pd.DataFrame()
+    cache[cache_key] = (version, df)
+    return df.copy()
@@ -0,0 +1,65 @@
+"""
+Thin long time series before they are handed to Plotly.
+
+``lttb`` (Largest-Triangle-Three-Buckets) keeps the points that best preserve
+a line's visual shape; ``minmax`` keeps each bucket's extremes and is cheaper,
+so ``points`` uses it to pre-thin very long series before LTTB. Series at or
+under the target are returned untouched, so a narrow date range is drawn at
+full resolution.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _as_float(x):
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return np.asarray(x, dtype="datetime64[ns]").astype("int64").astype(float)
+    return np.asarray(x, dtype=float)
+
+
+def minmax(x, y, n):
+    """Indices of each bucket's min and max, about ``n`` points in total, in order."""
+    size = len(y)
+    if size <= n or n < 4:
+        return np.arange(size)
+    edges = np.linspace(0, size, n // 2 + 1).astype(int)
+    keep = [0, size - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            chunk = y[lo:hi]
+            keep += [lo + int(np.argmin(chunk)), lo + int(np.argmax(chunk))]
+    return np.unique(keep)
+
+
+def lttb(x, y, n):
+    """Indices of the ``n`` points LTTB keeps; first and last are always kept."""
+    size = len(y)
+    if size <= n or n < 3:
+        return np.arange(size)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    keep = np.empty(n, dtype=int)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third vertex.
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else size
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def points(df, x, y, n):
+    """Rows of ``df`` to plot for ``y`` against ``x``, at most about ``n`` of them."""
+    df = df[[x, y]].dropna()
+    if len(df) <= n:
+        return df
+    xs, ys = _as_float(df[x]), _as_float(df[y])
+    idx = np.arange(len(df))
+    if len(df) > 8 * n:
+        idx = minmax(xs, ys, 8 * n)
+        xs, ys = xs[idx], ys[idx]
+    return df.iloc[idx[lttb(xs, ys, n)]]
@@ -0,0 +1,245 @@
+"""
+One row per user and day across every stream, for correlation analytics.
+
+Each stream contributes a few daily columns (training volume, bodyweight,
+calories, sleep, steps, …), kept in ``facts_<year>`` sidecars as
+``{column: [366 values]}`` indexed by day of year, ``None`` where nothing was
+logged. Summed columns hold the day's total; ``prs`` counts the sets that
+set a new PR. Averaged ones hold
+``<column>_sum`` and ``<column>_n``, like the rollups. Workout volume is also
+split per exercise as ``volume:<exercise>``.
+
+``record`` adds new entries into their day's slots on every write (from
+``recorder``). The ``facts_head`` sidecar lists the years with a document and
+every exercise with a volume column, so neither needs the year documents.
+``frame`` returns a calendar-continuous daily frame, so ``lag`` can shift it
+by whole days; frames are cached until a stream they read is written. Supplement compliance comes from the
+``compliance`` bitmasks and the recovery and hormone health scores from
+``scores`` (at the current formula version) rather than being copied here. ``rebuild`` recreates
+everything from the logs (``python manage.py rebuild-facts``).
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import compliance
+import indexes
+import pr_index
+import scores
+import storage
+
+# (column, stream, entry field, how several entries on one day combine)
+COLUMNS = [
+    ("volume", "workout", "volume", "sum"),
+    ("sets", "workout", "sets", "sum"),
+    ("top_weight", "workout", "weight", "max"),
+    ("prs", pr_index.EVENTS, None, "count"),
+    ("bodyweight", "body", "bodyweight", "mean"),
+    ("bodyfat_pct", "body", "bodyfat_pct", "mean"),
+    ("waist", "body", "waist", "mean"),
+    ("calories", "nutrition", "calories", "sum"),
+    ("protein", "nutrition", "protein", "sum"),
+    ("carbs", "nutrition", "carbs", "sum"),
+    ("fats", "nutrition", "fats", "sum"),
+    ("water_l", "nutrition", "water_l", "sum"),
+    ("sleep_hours", "recovery", "sleep_hours", "mean"),
+    ("stress_level", "recovery", "stress_level", "mean"),
+    ("energy_level", "recovery", "energy_level", "mean"),
+    ("resting_hr", "recovery", "resting_hr", "mean"),
+    ("sunlight_min", "hormone", "sunlight_min", "mean"),
+    ("daily_steps", "hormone", "daily_steps", "mean"),
+    ("alcohol_drinks", "hormone", "alcohol", "mean"),
+    ("sleep_quality", "hormone", "sleep_quality", "mean"),
+]
+
+KEYS = tuple(dict.fromkeys(key for _, key, _, _ in COLUMNS))
+
+SUPPLEMENT_COLUMN = "supplements_pct"
+
+# The hormone form's alcohol choices as a number of drinks.
+ALCOHOL = {"None": 0, "1 drink": 1, "2 drinks": 2, "3+ drinks": 3}
+
+EXERCISE_PREFIX = "volume:"
+
+HEAD_SIDECAR = "facts_head"
+
+# Streams a frame is read from; a new version of any drops the cached frames.
+STREAMS = tuple(k for k in KEYS if k != pr_index.EVENTS) + compliance.KEYS + scores.KEYS
+
+CACHE_SIZE = 64
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def _doc_name(year):
+    return f"facts_{year}"
+
+
+def _num(field, value):
+    return ALCOHOL.get(value) if field == "alcohol" else indexes.num(value)
+
+
+def _add(doc, name, i, v, how):
+    slots = doc.setdefault(name, [None] * indexes.DAY_SLOTS)
+    if how == "max":
+        slots[i] = v if slots[i] is None else max(slots[i], v)
+    else:
+        slots[i] = v if slots[i] is None else slots[i] + v
+
+
+def add(doc, key, entry, i):
+    """Add one entry's values into day slot ``i`` of a year doc."""
+    for column, k, field, how in COLUMNS:
+        if k != key:
+            continue
+        if how == "count":
+            _add(doc, column, i, 1, "sum")
+            continue
+        v = _num(field, entry.get(field))
+        if v is None:
+            continue
+        if how == "mean":
+            _add(doc, column + "_sum", i, v, "sum")
+            _add(doc, column + "_n", i, 1, "sum")
+        else:
+            _add(doc, column, i, v, how)
+    if key == "workout" and entry.get("exercise"):
+        v = _num("volume", entry.get("volume"))
+        if v is not None:
+            _add(doc, EXERCISE_PREFIX + entry["exercise"], i, v, "sum")
+
+
+def _apply(docs, user_dir, key, entries, fresh=False):
+    for entry in entries:
+        if not entry.get("date"):
+            continue
+        d = date.fromisoformat(str(entry["date"])[:10])
+        add(indexes.year_doc(docs, user_dir, _doc_name(d.year), dict, fresh), key, entry, indexes.slot(d))
+
+
+def marker(key):
+    return HEAD_SIDECAR
+
+
+def _head(docs, head=None):
+    """The head document: ``head`` plus the years and exercises of the year docs in ``docs``."""
+    head = head or {"years": [], "exercises": []}
+    found = {c[len(EXERCISE_PREFIX):] for doc in docs.values() for c in doc if c.startswith(EXERCISE_PREFIX)}
+    return {"years": indexes.years(docs, head["years"]), "exercises": sorted(found.union(head["exercises"]))}
+
+
+def record(user_dir, key, entries, head):
+    """Add newly logged entries into their days' facts."""
+    docs = {}
+    _apply(docs, user_dir, key, entries)
+    docs[HEAD_SIDECAR] = _head(docs, head)
+    indexes.write(user_dir, docs)
+
+
+def rebuild(user_dir, key=None):
+    """Recreate every stream's facts from the logs (they share documents)."""
+    with storage.user_lock(user_dir):
+        docs = {}
+        for k in KEYS:
+            # PRs are not a stored stream; replay the workout log to find the sets that set one.
+            entries = pr_index.events(storage.load(user_dir, "workout")) if k == pr_index.EVENTS \
+                else storage.load(user_dir, k)
+            _apply(docs, user_dir, k, entries, fresh=True)
+        docs[HEAD_SIDECAR] = _head(docs)
+        indexes.write(user_dir, docs)
+    return docs
+
+
+def _year(user_dir, year):
+    return indexes.read(user_dir, HEAD_SIDECAR, lambda: rebuild(user_dir), _doc_name(year)) or {}
+
+
+def exercises(user_dir):
+    """Exercises with a per-exercise volume column, across every year."""
+    head = indexes.read(user_dir, HEAD_SIDECAR, lambda: rebuild(user_dir))
+    return head["exercises"] if head else []
+
+
+def frame(user_dir, since, until=None, exercises=()):
+    """Daily facts from ``since`` to ``until`` (dates, inclusive), one row per calendar day.
+
+    Columns are every COLUMNS name, SUPPLEMENT_COLUMN, the ``scores`` columns
+    and ``volume:<exercise>`` for the given exercises; days without a value hold NaN.
+    """
+    until = until or date.today()
+    key = (user_dir, since, until, tuple(exercises), tuple(storage.version(user_dir, s) for s in STREAMS))
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key].copy()
+    df = _frame(user_dir, since, until, exercises)
+    with _lock:
+        _cache[key] = df
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return df.copy()
+
+
+def _frame(user_dir, since, until, exercises):
+    wanted = [c for c, _, _, _ in COLUMNS] + [EXERCISE_PREFIX + ex for ex in exercises]
+    means = {c for c, _, _, how in COLUMNS if how == "mean"}
+    docs = {year: _year(user_dir, year) for year in range(since.year, until.year + 1)}
+
+    def column(name):
+        return indexes.window(since, until, lambda year, days: np.array(
+            docs[year].get(name) or [None] * days, dtype="float64")[:days])
+
+    columns = {c: column(c + "_sum") / column(c + "_n") if c in means else column(c) for c in wanted}
+    dates, taken, tracked = compliance.window(user_dir, since, until)
+    columns[SUPPLEMENT_COLUMN] = compliance.daily(taken, tracked)
+    for key, column in scores.COLUMNS.items():
+        daily = scores.daily(user_dir, key, since, until).set_index("date")[column]
+        columns[column] = daily.reindex(dates).to_numpy(dtype="float64")
+    return pd.DataFrame(columns, index=dates)
+
+
+def lag(df, days=1, columns=None):
+    """``df`` plus ``<column>_lag<days>`` columns holding each value from ``days`` days earlier."""
+    columns = list(columns if columns is not None else df.columns)
+    shifted = df[columns].shift(days)
+    shifted.columns = [f"{c}_lag{days}" for c in columns]
+    return pd.concat([df, shifted], axis=1)
+
+
+def correlations(df, target, min_days=14):
+    """Pearson correlation of every column with ``target``, strongest first.
+
+    Only days where both are present count; columns with fewer than
+    ``min_days`` such days are left out.
+    """
+    x = df.drop(columns=[target]).to_numpy(dtype="float64")
+    y = df[target].to_numpy(dtype="float64")[:, None]
+    both = ~np.isnan(x) & ~np.isnan(y)
+    n = both.sum(axis=0)
+    xs, ys = np.where(both, x, 0.0), np.where(both, y, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mx, my = xs.sum(axis=0) / n, ys.sum(axis=0) / n
+        cov = (xs * ys).sum(axis=0) / n - mx * my
+        vx = (xs * xs).sum(axis=0) / n - mx * mx
+        vy = (ys * ys).sum(axis=0) / n - my * my
+        r = cov / np.sqrt(vx * vy)
+    out = pd.Series(r, index=df.columns.drop(target))[(n >= min_days) & np.isfinite(r)]
+    return out.reindex(out.abs().sort_values(ascending=False).index)
+
+
+def split(df, predictor, threshold, target):
+    """Mean ``target`` on days ``predictor`` was below ``threshold`` vs at or above it.
+
+    Returns ``{"below": (mean, days), "above": (mean, days)}``; means are None without days.
+    """
+    both = df[[predictor, target]].dropna()
+    below = both[predictor] < threshold
+    out = {}
+    for name, rows in (("below", both[below]), ("above", both[~below])):
+        out[name] = (float(rows[target].mean()) if len(rows) else None, len(rows))
+    return out
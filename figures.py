@@ -0,0 +1,91 @@
+"""
+Built Plotly figures, cached across reruns and sessions.
+
+Building a figure (``make_subplots``, ``px.*``, layout merges) costs far more
+than re-sending one, and most reruns redraw charts whose data has not moved.
+Figures are cached as JSON specs under
+``(user, streams, data version, chart id, window)``; a write bumps the stream's
+version, so stale entries are never hit again and age out of the LRU, which is
+bounded by the total size of the cached specs (``FITNESS_FIGURE_CACHE_MB``).
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+import data
+import storage
+
+MAX_BYTES = int(os.environ.get("FITNESS_FIGURE_CACHE_MB", 64)) * 1024 * 1024
+
+# Cached for builders that had nothing to plot, so the empty case is cached too.
+EMPTY = "null"
+
+_specs = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "bytes": 0}
+
+
+def get(key):
+    with _lock:
+        spec = _specs.get(key)
+        if spec is None:
+            _stats["misses"] += 1
+            return None
+        _specs.move_to_end(key)
+        _stats["hits"] += 1
+        return spec
+
+
+def put(key, spec):
+    with _lock:
+        old = _specs.pop(key, None)
+        if old is not None:
+            _stats["bytes"] -= len(old)
+        _specs[key] = spec
+        _stats["bytes"] += len(spec)
+        while _stats["bytes"] > MAX_BYTES and len(_specs) > 1:
+            _, evicted = _specs.popitem(last=False)
+            _stats["bytes"] -= len(evicted)
+
+
+def clear():
+    with _lock:
+        _specs.clear()
+        _stats["bytes"] = 0
+
+
+def stats():
+    with _lock:
+        return dict(_stats, entries=len(_specs))
+
+
+def spec(user_dir, streams, chart_id, build, window=None):
+    """JSON spec for a chart, calling ``build()`` only when its streams changed.
+
+    ``build`` returns a Figure, or None when there is nothing to plot. ``window``
+    is anything else the figure depends on (a date range, a filter value).
+    """
+    streams = (streams,) if isinstance(streams, str) else tuple(streams)
+    key = (user_dir, streams, tuple(storage.version(user_dir, s) for s in streams), chart_id, window)
+    cached = get(key)
+    if cached is None:
+        fig = build()
+        cached = EMPTY if fig is None else pio.to_json(fig, validate=False)
+        put(key, cached)
+    return None if cached == EMPTY else cached
+
+
+def show(streams, chart_id, build, window=None):
+    """Draw a cached chart for the current user. Returns False if there was nothing to draw."""
+    cached = spec(data.get_user_dir(), streams, chart_id, build, window)
+    if cached is None:
+        return False
+    # The spec was validated when it was built; skip plotly's re-validation.
+    st.plotly_chart(go.Figure(json.loads(cached), _validate=False), use_container_width=True)
+    return True
@@ -0,0 +1,230 @@
+"""
+Bulk import of historical entries from CSV, JSON Lines or JSON array files.
+
+Rows are read one at a time, validated against the same ranges as the
+logging forms and appended CHUNK_ROWS at a time, so a 100k-row file costs
+one write per chunk and memory does not grow with the file. The PR index and
+every derived index the stream feeds (see ``indexes``) are rebuilt once when
+the last chunk is in, not per row, or when the file fails after a chunk was
+written. Those rebuilds load the stream's whole history, so their memory does
+grow with it (roughly 80 MB for 100k workout rows).
+
+The whole import holds the user's write lock; it has no Streamlit
+dependency (``python manage.py import`` and the Import page both use it).
+"""
+
+import csv
+import json
+import os
+from datetime import date
+
+import indexes
+import pr_index
+import scores
+import storage
+
+CHUNK_ROWS = 1000
+
+# Rejected rows reported back; the rest are only counted.
+MAX_ERRORS = 50
+
+# Text characters read per step when scanning a JSON array.
+READ_BLOCK = 65536
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "json"}
+
+# field: (type, min, max) — the bounds of the matching form inputs.
+FIELDS = {
+    "workout": {
+        "date": ("date",), "training_day": ("text",), "exercise": ("text",),
+        "sets": ("int", 1, 20), "reps": ("int", 1, 100), "weight": ("float", 0.0, 500.0),
+        "rpe": ("float", 1.0, 10.0), "volume": ("float", 0.0, None), "notes": ("text",),
+    },
+    "body": {
+        "date": ("date",), "bodyweight": ("float", 30.0, 250.0), "bodyfat_pct": ("float", 3.0, 60.0),
+        "waist": ("float", 40.0, 200.0), "chest": ("float", 50.0, 200.0), "arms": ("float", 20.0, 80.0),
+        "hips": ("float", 50.0, 200.0), "lean_mass": ("float", 0.0, 250.0), "notes": ("text",),
+    },
+    "nutrition": {
+        "date": ("date",), "calories": ("int", 0, 10000), "protein": ("int", 0, 500),
+        "carbs": ("int", 0, 1000), "fats": ("int", 0, 300), "water_l": ("float", 0.0, 10.0),
+        "fiber": ("int", 0, 100), "est_calories_from_macros": ("int", 0, None), "notes": ("text",),
+    },
+    "recovery": {
+        "date": ("date",), "sleep_hours": ("float", 0.0, 14.0), "stress_level": ("int", 1, 5),
+        "energy_level": ("int", 1, 5), "resting_hr": ("int", 30, 120),
+        "recovery_score": ("float", 0.0, 5.0), "notes": ("text",),
+    },
+}
+
+REQUIRED = {
+    "workout": ("date", "exercise", "sets", "reps", "weight"),
+    "body": ("date", "bodyweight"),
+    "nutrition": ("date", "calories"),
+    "recovery": ("date", "sleep_hours"),
+}
+
+
+class RowError(ValueError):
+    """A row that cannot be imported; the message says which field and why."""
+
+
+def detect_format(name):
+    fmt = FORMATS.get(os.path.splitext(name)[1].lower())
+    if fmt is None:
+        raise ValueError(f"unsupported file type: {name} (expected {', '.join(sorted(FORMATS))})")
+    return fmt
+
+
+def _json_array(f):
+    # Decode one element at a time so a large array is never held whole.
+    decoder = json.JSONDecoder()
+    buf, pos, started = "", 0, False
+    while True:
+        while pos < len(buf) and (buf[pos].isspace() or buf[pos] == "," or (buf[pos] == "[" and not started)):
+            started |= buf[pos] == "["
+            pos += 1
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            block = f.read(READ_BLOCK)
+            if not block:
+                if buf[pos:].strip():
+                    raise ValueError("truncated JSON array")
+                return
+            buf, pos = buf[pos:] + block, 0
+            continue
+        yield value
+        pos = end
+
+
+def rows(f, fmt):
+    """(position, raw row) pairs from an open text file; position is a line or element number."""
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for n, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield n, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield n, RowError(f"invalid JSON: {e.msg}")
+    else:
+        yield from enumerate(_json_array(f), 1)
+
+
+def _convert(field, kind, raw):
+    if kind[0] == "text":
+        return str(raw).strip()
+    if kind[0] == "date":
+        try:
+            return date.fromisoformat(str(raw).strip()[:10]).isoformat()
+        except ValueError:
+            raise RowError(f"{field}: not a YYYY-MM-DD date: {raw!r}") from None
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        raise RowError(f"{field}: not a number: {raw!r}") from None
+    lo, hi = kind[1], kind[2]
+    if value != value or (lo is not None and value < lo) or (hi is not None and value > hi):
+        raise RowError(f"{field}: {value:g} outside {lo}–{hi if hi is not None else '∞'}")
+    return int(value) if kind[0] == "int" else value
+
+
+def _derive(key, entry):
+    # Fill the computed fields the logging forms add, using the same formulas.
+    if key == "workout" and "volume" not in entry:
+        entry["volume"] = round(entry["sets"] * entry["reps"] * entry["weight"], 1)
+    elif key == "body" and "lean_mass" not in entry and "bodyfat_pct" in entry:
+        entry["lean_mass"] = round(entry["bodyweight"] * (1 - entry["bodyfat_pct"] / 100), 1)
+    elif key == "nutrition" and "est_calories_from_macros" not in entry \
+            and all(m in entry for m in ("protein", "carbs", "fats")):
+        entry["est_calories_from_macros"] = round(entry["protein"] * 4 + entry["carbs"] * 4 + entry["fats"] * 9)
+    elif key == "recovery" and "recovery_score" not in entry \
+            and all(m in entry for m in ("stress_level", "energy_level", "resting_hr")):
+        entry["recovery_score"] = scores.recovery(entry["sleep_hours"], entry["stress_level"],
+                                                  entry["energy_level"], entry["resting_hr"])
+    return entry
+
+
+def validate(key, row):
+    """A clean entry for ``key`` from one raw row, or RowError.
+
+    Unknown columns are dropped and blank optional cells left out.
+    """
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise RowError(f"expected an object, got {type(row).__name__}")
+    entry = {}
+    for field, kind in FIELDS[key].items():
+        raw = row.get(field)
+        if raw is None or (isinstance(raw, str) and not raw.strip()):
+            if field in REQUIRED[key]:
+                raise RowError(f"{field}: missing")
+            continue
+        entry[field] = _convert(field, kind, raw)
+    return _derive(key, entry)
+
+
+def _finish_prs(user_dir, before):
+    after = pr_index.rebuild(user_dir)
+    changed = [pr for name, pr in after["exercises"].items()
+               if (before["exercises"].get(name, {}).get("best_weight"),
+                   before["exercises"].get(name, {}).get("best_reps")) != (pr["best_weight"], pr["best_reps"])]
+    if changed:
+        # Keep the PR stream in step, as recorder.record does for logged sets.
+        storage.append(user_dir, "pr", *[{k: pr[k] for k in ("exercise", "best_weight", "best_reps", "date")}
+                                         for pr in changed])
+    return [pr["exercise"] for pr in changed]
+
+
+def run(user_dir, key, f, fmt, chunk_rows=CHUNK_ROWS, progress=None):
+    """Import every valid row of an open text file into ``key``.
+
+    ``progress(report)`` is called after each chunk is written. Returns
+    ``{"read", "imported", "rejected", "errors": [(position, message)], "prs"}``.
+    """
+    if key not in FIELDS:
+        raise ValueError(f"cannot import {key!r}; supported: {', '.join(FIELDS)}")
+    report = {"read": 0, "imported": 0, "rejected": 0, "errors": [], "prs": []}
+
+    def flush(chunk):
+        if chunk:
+            storage.append(user_dir, key, *chunk)
+            report["imported"] += len(chunk)
+        if progress:
+            progress(report)
+
+    with storage.user_lock(user_dir):
+        before = pr_index.load(user_dir) if key == "workout" else None
+        try:
+            chunk = []
+            for pos, row in rows(f, fmt):
+                report["read"] += 1
+                try:
+                    chunk.append(validate(key, row))
+                except RowError as e:
+                    report["rejected"] += 1
+                    if len(report["errors"]) < MAX_ERRORS:
+                        report["errors"].append((pos, str(e)))
+                if len(chunk) >= chunk_rows:
+                    flush(chunk)
+                    chunk = []
+            flush(chunk)
+        finally:
+            # Chunks already written stay in the log when the file fails part-way, so index them too.
+            if report["imported"]:
+                if before is not None:
+                    report["prs"] = _finish_prs(user_dir, before)
+                indexes.rebuild(user_dir, key)
+    return report
+
+
+def run_file(user_dir, key, path, **kwargs):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return run(user_dir, key, f, detect_format(path), **kwargs)
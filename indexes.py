@@ -0,0 +1,129 @@
+"""
+Registry of the derived indexes kept beside each user's logs.
+
+Every index module is built from one or more streams into sidecars and has
+the same shape:
+
+- ``KEYS``: the streams it is derived from (``pr_index.EVENTS`` stands for
+  the logged sets that set a new PR);
+- ``marker(key)``: the sidecar that exists once the index is built for ``key``;
+- ``record(user_dir, key, entries, head)``: fold newly logged entries in,
+  given the marker document already read;
+- ``rebuild(user_dir, key=None)``: recreate it from the logs for ``key`` (or
+  every stream in KEYS) and return the documents written, by sidecar name.
+  Indexes whose documents mix streams always rebuild all of them.
+
+``record`` and ``rebuild`` here run every index a stream feeds, for
+``recorder``, ``importer`` and ``manage.py``. ``read`` is the lazy read the
+index modules share: an index is only built the first time it is read. The
+PR index (``pr_index``) is separate because a write needs it as it was
+before the append.
+
+The helpers below are shared by the modules: ``num`` for logged values,
+``year_doc``/``write`` for the per-year documents an index touches, and
+``slot``/``window`` for year documents that hold one value per day of year
+(DAY_SLOTS of them, so leap years fit).
+"""
+
+from datetime import date
+
+import numpy as np
+
+import asof
+import compliance
+import facts
+import rollups
+import scores
+import storage
+import trends
+
+# name (as in ``manage.py rebuild-<name>``): module, in the order writes are folded in.
+INDEXES = {
+    "rollups": rollups,
+    "trends": trends,
+    "supplements": compliance,
+    "latest": asof,
+    "facts": facts,
+    "scores": scores,
+}
+
+
+def record(user_dir, key, entries):
+    """Fold newly logged entries into every built index derived from ``key``."""
+    for index in INDEXES.values():
+        if key not in index.KEYS:
+            continue
+        head = storage.read_sidecar(user_dir, index.marker(key))
+        # Never built: the first read rebuilds from the logs, these entries included.
+        if head is not None:
+            index.record(user_dir, key, entries, head)
+
+
+def rebuild(user_dir, key):
+    """Recreate every index derived from ``key`` from the logs, e.g. after a bulk import."""
+    for index in INDEXES.values():
+        if key in index.KEYS:
+            index.rebuild(user_dir, key)
+
+
+def read(user_dir, marker, build, name=None):
+    """Sidecar ``name`` (default ``marker``) of an index, calling ``build()`` first if it was never built.
+
+    ``build`` rebuilds the index and returns the documents it wrote, by name.
+    """
+    name = name or marker
+    doc = storage.read_sidecar(user_dir, name)
+    if doc is None and (name == marker or storage.read_sidecar(user_dir, marker) is None):
+        doc = build().get(name)
+    return doc
+
+
+DAY_SLOTS = 366
+
+
+def num(value):
+    """A logged value as a float, or None when it is missing, not a number or NaN."""
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    return v if v == v else None
+
+
+def year_doc(docs, user_dir, name, empty, fresh=False):
+    """Document ``name`` out of ``docs``, first read from its sidecar (or ``empty()``) into it.
+
+    ``fresh`` (during a rebuild) starts from ``empty()`` without reading.
+    """
+    if name not in docs:
+        doc = None if fresh else storage.read_sidecar(user_dir, name)
+        docs[name] = doc if doc is not None else empty()
+    return docs[name]
+
+
+def write(user_dir, docs):
+    for name, doc in docs.items():
+        storage.write_sidecar(user_dir, name, doc)
+
+
+def years(docs, known=()):
+    """``known`` plus the year of every ``<name>_<year>`` document in ``docs``, sorted."""
+    return sorted(set(known) | {int(name.rsplit("_", 1)[1]) for name in docs})
+
+
+def slot(day):
+    """The slot of ``day`` (a date) in its year's day-of-year list."""
+    return day.timetuple().tm_yday - 1
+
+
+def window(since, until, year_slots):
+    """One value per day from ``since`` to ``until`` (dates, inclusive) as an array.
+
+    ``year_slots(year, days)`` returns that year's first ``days`` slots.
+    """
+    if until < since:
+        return np.empty(0)
+    parts = [np.asarray(year_slots(year, (date(year + 1, 1, 1) - date(year, 1, 1)).days))
+             for year in range(since.year, until.year + 1)]
+    start = slot(since)
+    return np.concatenate(parts)[start:start + (until - since).days + 1]
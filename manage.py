@@ -0,0 +1,259 @@
+"""
+Maintenance commands for the fitness data store.
+
+    python manage.py migrate [--data-dir fitness_data] [--db fitness_data/fitness.db]
+    python manage.py rebuild-prs [--user you_example_com]
+    python manage.py rebuild-rollups|trends|supplements|latest|facts|scores [--user you_example_com]
+    python manage.py rescore [--user you_example_com] [--workers 4] [--force]
+    python manage.py import you_example_com workout history.csv [--chunk 1000]
+    python manage.py export [--user you_example_com] [--out exports] [--format arrow|parquet]
+    python manage.py stress-writes [--writers 8] [--entries 50] [--backend jsonl]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date
+
+import auth
+import facts
+import importer
+import indexes
+import pr_index
+import recorder
+import rollups
+import scores
+import snapshots
+import storage
+
+
+# What each ``rebuild-<name>`` command recomputes, for --help.
+REBUILD_HELP = {
+    "rollups": "volume/nutrition/recovery rollups",
+    "trends": "body/nutrition/recovery trend lines",
+    "supplements": "supplement compliance bitmasks",
+    "latest": "the Dashboard's latest-value indexes",
+    "facts": "the daily fact table behind the Insights page",
+    "scores": "stored recovery/hormone scores (see also rescore)",
+}
+
+
+def user_dirs(data_dir):
+    for name in sorted(os.listdir(data_dir)):
+        path = os.path.join(data_dir, name)
+        if os.path.isdir(path):
+            yield path
+
+
+def migrate(args):
+    """Import every user folder and users.json into the SQLite database."""
+    target = storage.SqliteBackend(args.db or os.path.join(args.data_dir, "fitness.db"))
+    for user_dir in user_dirs(args.data_dir):
+        counts = []
+        for key in storage.STREAMS:
+            # The app may already be writing to the database; never overwrite what it saved meanwhile.
+            seen = target.version(user_dir, key)
+            records = storage.read_files(user_dir, key)
+            try:
+                target.save(user_dir, key, records, expect=seen)
+            except storage.StaleWriteError:
+                counts.append(f"{key}=skipped (written during migrate, run again)")
+                continue
+            counts.append(f"{key}={len(records)}")
+        print(f"{os.path.basename(user_dir)}: {', '.join(counts)}")
+
+    user_file = os.path.join(args.data_dir, os.path.basename(auth.USER_FILE))
+    if os.path.exists(user_file):
+        with open(user_file) as f:
+            users = json.load(f)
+        added = sum(target.add_user(email, record) for email, record in users.items())
+        print(f"users: {added} imported, {len(users) - added} already present")
+
+
+def selected_users(args):
+    dirs = list(user_dirs(args.data_dir))
+    if args.user:
+        dirs = [d for d in dirs if os.path.basename(d) == args.user]
+    return dirs
+
+
+def rebuild_prs(args):
+    """Recompute the PR index from each user's workout log."""
+    for user_dir in selected_users(args):
+        index = pr_index.rebuild(user_dir)
+        print(f"{os.path.basename(user_dir)}: {len(index['order'])} exercises")
+
+
+def rebuild_index(args):
+    """Recompute one derived index (see ``indexes.INDEXES``) from each user's logs."""
+    index = indexes.INDEXES[args.index]
+    for user_dir in selected_users(args):
+        docs = index.rebuild(user_dir)
+        print(f"{os.path.basename(user_dir)}: {len(docs)} documents")
+
+
+def _rescore_user(job):
+    user_dir, force = job
+    done = []
+    for key in scores.VERSIONS:
+        if force or not scores.current(user_dir, key):
+            scores.rebuild(user_dir, key)
+            done.append(key)
+    return os.path.basename(user_dir), done
+
+
+def rescore(args):
+    """Score every user's history with the current formulas, skipping those already at this version."""
+    jobs = [(user_dir, args.force) for user_dir in selected_users(args)]
+    with multiprocessing.Pool(args.workers) as pool:
+        for name, done in pool.imap_unordered(_rescore_user, jobs):
+            print(f"{name}: {', '.join(done) or 'up to date'}")
+
+
+def import_rows(args):
+    """Stream a CSV/JSON file into one user's stream, printing progress per chunk."""
+    user_dir = os.path.join(args.data_dir, args.user)
+    os.makedirs(user_dir, exist_ok=True)
+
+    def progress(report):
+        print(f"\r{report['read']:,} read · {report['imported']:,} imported · {report['rejected']:,} rejected",
+              end="", flush=True)
+
+    report = importer.run_file(user_dir, args.key, args.file, chunk_rows=args.chunk, progress=progress)
+    print()
+    for pos, message in report["errors"]:
+        print(f"  row {pos}: {message}")
+    if report["rejected"] > len(report["errors"]):
+        print(f"  … and {report['rejected'] - len(report['errors'])} more")
+    if report["prs"]:
+        print(f"PRs updated: {', '.join(report['prs'])}")
+
+
+def export(args):
+    """Write each user's streams as columnar files for the analytics pipeline."""
+    if not snapshots.available():
+        sys.exit("export needs pyarrow: pip install pyarrow")
+    for user_dir in selected_users(args):
+        name = os.path.basename(user_dir)
+        written = snapshots.export(user_dir, os.path.join(args.out, name), args.format)
+        print(f"{name}: {', '.join(f'{k}={n}' for k, n in written.items())}")
+
+
+def _stress_worker(backend, data_dir, writer, entries, users):
+    os.environ["FITNESS_STORAGE"] = backend
+    os.environ["FITNESS_DB"] = os.path.join(data_dir, "fitness.db")
+    storage._backend = None
+    auth.USER_FILE = os.path.join(data_dir, "users.json")
+    auth._registry = None
+    user_dir = os.path.join(data_dir, "stress_user")
+    for i in range(entries):
+        recorder.record(user_dir, "workout", {
+            "date": f"2026-01-{i % 28 + 1:02d}", "training_day": "Full Body", "exercise": f"Lift {i % 3}",
+            "sets": 1, "reps": 5, "weight": float(writer * entries + i), "volume": 5.0, "notes": "",
+        })
+    for i in range(users):
+        auth.register_user(f"w{writer}-{i}@stress.test", "pw")
+
+
+def stress_writes(args):
+    """N processes log to one account at once; every entry must survive."""
+    data_dir = tempfile.mkdtemp(prefix="fitness-stress-")
+    os.environ["FITNESS_STORAGE"] = args.backend
+    os.environ["FITNESS_DB"] = os.path.join(data_dir, "fitness.db")
+    storage._backend = None
+    auth.USER_FILE = os.path.join(data_dir, "users.json")
+    auth._registry = None
+    user_dir = os.path.join(data_dir, "stress_user")
+    os.makedirs(user_dir)
+    # Built up front, so every write updates them instead of leaving them to a rebuild on first read.
+    pr_index.rebuild(user_dir)
+    for index in indexes.INDEXES.values():
+        index.rebuild(user_dir)
+
+    procs = [multiprocessing.Process(target=_stress_worker,
+                                     args=(args.backend, data_dir, w, args.entries, args.users))
+             for w in range(args.writers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    expected = args.writers * args.entries
+    workouts = storage.load(user_dir, "workout")
+    weekly_sets = sum(b.get("sets", 0) for b in rollups.weekly(user_dir).values())
+    fact_sets = facts.frame(user_dir, date(2026, 1, 1), date(2026, 1, 31))["sets"].sum()
+    best = max(e["best_weight"] for e in pr_index.load(user_dir)["exercises"].values())
+    registered = sum(1 for w in range(args.writers) for i in range(args.users)
+                     if auth.get_user(f"w{w}-{i}@stress.test"))
+    checks = [
+        ("workout entries", len(workouts), expected),
+        ("rollup sets", int(weekly_sets), expected),
+        ("fact table sets", int(fact_sets), expected),
+        ("best PR weight", best, float(expected - 1)),
+        ("accounts", registered, args.writers * args.users),
+    ]
+    failed = False
+    for name, got, want in checks:
+        ok = got == want
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {got} (expected {want})")
+    if failed or any(p.exitcode for p in procs):
+        print(f"data left in {data_dir}")
+        sys.exit(1)
+    shutil.rmtree(data_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=storage.DATA_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("migrate", help="import JSON folders into SQLite")
+    p.add_argument("--db", help="database path (default: <data-dir>/fitness.db)")
+    p.set_defaults(func=migrate)
+
+    p = sub.add_parser("rebuild-prs", help="recompute PR indexes from workouts")
+    p.add_argument("--user", help="only this user folder")
+    p.set_defaults(func=rebuild_prs)
+
+    for name in indexes.INDEXES:
+        p = sub.add_parser(f"rebuild-{name}", help=f"recompute {REBUILD_HELP[name]}")
+        p.add_argument("--user", help="only this user folder")
+        p.set_defaults(func=rebuild_index, index=name)
+
+    p = sub.add_parser("rescore", help="recompute stored recovery/hormone scores after a formula change")
+    p.add_argument("--user", help="only this user folder")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="processes scoring users in parallel")
+    p.add_argument("--force", action="store_true", help="rescore users already at the current version")
+    p.set_defaults(func=rescore)
+
+    p = sub.add_parser("import", help="bulk-load history from a CSV, JSON Lines or JSON file")
+    p.add_argument("user", help="user folder, e.g. you_example_com")
+    p.add_argument("key", choices=list(importer.FIELDS))
+    p.add_argument("file")
+    p.add_argument("--chunk", type=int, default=importer.CHUNK_ROWS, help="rows per write")
+    p.set_defaults(func=import_rows)
+
+    p = sub.add_parser("export", help="write every stream as Arrow IPC or Parquet files")
+    p.add_argument("--user", help="only this user folder")
+    p.add_argument("--out", default="exports", help="output directory (one folder per user)")
+    p.add_argument("--format", default="arrow", choices=sorted(snapshots.FORMATS))
+    p.set_defaults(func=export)
+
+    p = sub.add_parser("stress-writes", help="concurrent writers must not lose updates")
+    p.add_argument("--writers", type=int, default=8)
+    p.add_argument("--entries", type=int, default=50, help="sets logged per writer")
+    p.add_argument("--users", type=int, default=2, help="accounts registered per writer")
+    p.add_argument("--backend", default="jsonl", choices=sorted(storage.BACKENDS))
+    p.set_defaults(func=stress_writes)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Per-user personal-record index, maintained as sets are logged.
+
+The index lives in the ``pr_index`` sidecar::
+
+    {"exercises": {name: {exercise, best_weight, best_reps, date,
+                          best_e1rm, e1rm_date, best_volume, volume_date}},
+     "order": [names sorted by best_weight, heaviest first]}
+
+Logging a set touches one exercise entry and re-slots it in ``order``, so the
+cost does not depend on how long the workout history is. ``rebuild`` recreates
+the index from the workout log (``python manage.py rebuild-prs``).
+"""
+
+import bisect
+
+import analytics
+import storage
+
+SIDECAR = "pr_index"
+
+# Not a stored stream: the logged sets that set a new PR, as passed to ``indexes.record``.
+EVENTS = "pr_set"
+
+
+def empty():
+    return {"exercises": {}, "order": []}
+
+
+def e1rm(weight, reps):
+    return round(float(analytics.e1rm(weight, reps)), 1)
+
+
+def _set_values(entry):
+    # Workout sets carry weight/reps; records from the PR stream carry best_*.
+    weight = float(entry.get("weight", entry.get("best_weight", 0)) or 0)
+    reps = int(entry.get("reps", entry.get("best_reps", 0)) or 0)
+    volume = float(entry.get("volume", weight * reps * int(entry.get("sets", 1) or 1)))
+    return weight, reps, volume
+
+
+def update(index, entry, manual=False):
+    """Fold one set into the index. Returns True if it beat an existing weight or e1RM PR.
+
+    A heavier set for fewer reps and more reps at a lighter weight both count,
+    so 100 kg × 8 is a PR over 102.5 kg × 1.
+
+    ``manual`` records from the PR page overwrite the weight PR outright.
+    """
+    exercises = index["exercises"]
+    name = entry["exercise"]
+    weight, reps, volume = _set_values(entry)
+    day = str(entry.get("date", ""))
+    est = e1rm(weight, reps)
+
+    current = exercises.get(name)
+    improved = False
+    if current is None:
+        current = exercises[name] = {
+            "exercise": name, "best_weight": weight, "best_reps": reps, "date": day,
+            "best_e1rm": est, "e1rm_date": day, "best_volume": volume, "volume_date": day,
+        }
+    else:
+        if manual or weight > current["best_weight"] or \
+           (weight == current["best_weight"] and reps > current["best_reps"]):
+            improved = not manual
+            current.update(best_weight=weight, best_reps=reps, date=day)
+        if est > current["best_e1rm"]:
+            improved = improved or not manual
+            current.update(best_e1rm=est, e1rm_date=day)
+        if volume > current["best_volume"]:
+            current.update(best_volume=volume, volume_date=day)
+
+    order = index["order"]
+    if name in order:
+        order.remove(name)
+    bisect.insort(order, name, key=lambda ex: -exercises[ex]["best_weight"])
+    return improved
+
+
+def load(user_dir):
+    index = storage.read_sidecar(user_dir, SIDECAR)
+    if index is None:
+        index = rebuild(user_dir)
+    return index
+
+
+def record(user_dir, key, entries, index=None):
+    """Apply newly logged workout sets or manual PRs; returns the entries that set a new PR.
+
+    Pass the index as loaded *before* the entries were appended, otherwise a
+    first-time rebuild would already contain them.
+    """
+    index = index if index is not None else load(user_dir)
+    changed, improved = [], []
+    for entry in entries:
+        before = dict(index["exercises"].get(entry["exercise"], {}))
+        if update(index, entry, manual=(key == "pr")):
+            improved.append(entry)
+        after = index["exercises"][entry["exercise"]]
+        if (before.get("best_weight"), before.get("best_reps")) != (after["best_weight"], after["best_reps"]):
+            changed.append(after)
+    storage.write_sidecar(user_dir, SIDECAR, index)
+    if key == "workout" and changed:
+        # Keep the PR stream (pr_tracker) in step for exports and older readers.
+        storage.append(user_dir, "pr", *[{k: pr[k] for k in ("exercise", "best_weight", "best_reps", "date")}
+                                         for pr in changed])
+    return improved
+
+
+def rebuild(user_dir):
+    with storage.user_lock(user_dir):
+        index = empty()
+        for entry in storage.load(user_dir, "workout"):
+            if entry.get("exercise"):
+                update(index, entry)
+        for entry in storage.load(user_dir, "pr"):
+            update(index, entry, manual=entry.get("source") == "manual")
+        storage.write_sidecar(user_dir, SIDECAR, index)
+    return index
+
+
+def events(entries):
+    """The sets of a workout log (in logged order) that beat their exercise's best so far."""
+    index = empty()
+    return [entry for entry in entries if entry.get("exercise") and update(index, entry)]
+
+
+def ranked(index):
+    return [index["exercises"][name] for name in index["order"]]
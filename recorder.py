@@ -0,0 +1,25 @@
+"""
+The single write path for logged entries.
+
+``record`` appends to the stream and then brings every derived index up to
+date, so the Streamlit pages, importers and maintenance commands all keep
+the same invariants. It has no Streamlit dependency.
+"""
+
+import indexes
+import pr_index
+import storage
+
+PR_KEYS = ("workout", "pr")
+
+
+def record(user_dir, key, *entries):
+    """Append entries to a stream. Returns {"prs": [exercises that set a new PR]}."""
+    with storage.user_lock(user_dir):
+        index = pr_index.load(user_dir) if key in PR_KEYS else None
+        storage.append(user_dir, key, *entries)
+        prs = pr_index.record(user_dir, key, entries, index) if index is not None else []
+        indexes.record(user_dir, key, entries)
+        if prs:
+            indexes.record(user_dir, pr_index.EVENTS, prs)
+    return {"prs": [entry["exercise"] for entry in prs]}
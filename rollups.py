@@ -0,0 +1,149 @@
+"""
+Materialized daily, weekly and monthly aggregates per user.
+
+Buckets hold running sums and counts, so a logged entry only adds into the
+three buckets its date falls in. Weeks are keyed by ISO year and week
+(``2026-W08``) so the same week number in different years never merges.
+
+Sidecars: ``rollups_daily_<year>``, ``rollups_weekly_<iso_year>`` and
+``rollups_monthly_<year>``, each ``{bucket_key: {metric: value}}``, so a write
+only rewrites the current year's documents; ``rollups_years`` lists the years
+that have any. Averages are ``<metric>_sum`` divided by ``<metric>_n``; see
+``value``.
+"""
+
+from datetime import date
+
+import pandas as pd
+
+import indexes
+import storage
+
+KEYS = ("workout", "nutrition", "recovery")
+
+NUTRITION_TOTALS = ("calories", "protein", "carbs", "fats", "water_l")
+RECOVERY_AVERAGES = ("recovery_score", "stress_level", "sleep_hours")
+
+
+def bucket_keys(day):
+    d = date.fromisoformat(str(day)[:10])
+    iso_year, iso_week, _ = d.isocalendar()
+    return d.isoformat(), f"{iso_year}-W{iso_week:02d}", d.strftime("%Y-%m")
+
+
+YEARS_SIDECAR = "rollups_years"
+
+
+def _sidecar(grain, year):
+    return f"rollups_{grain}_{year}"
+
+
+def add(bucket, key, entry):
+    """Add one entry's contribution to a bucket."""
+    if key == "workout":
+        sets = indexes.num(entry.get("sets")) or 0
+        bucket["volume"] = bucket.get("volume", 0) + (indexes.num(entry.get("volume")) or 0)
+        bucket["sets"] = bucket.get("sets", 0) + sets
+        by_ex = bucket.setdefault("sets_by_exercise", {})
+        ex = entry.get("exercise", "Other")
+        by_ex[ex] = by_ex.get(ex, 0) + sets
+    elif key == "nutrition":
+        bucket["nutrition_n"] = bucket.get("nutrition_n", 0) + 1
+        for m in NUTRITION_TOTALS:
+            v = indexes.num(entry.get(m))
+            if v is not None:
+                bucket[m] = bucket.get(m, 0) + v
+    elif key == "recovery":
+        for m in RECOVERY_AVERAGES:
+            v = indexes.num(entry.get(m))
+            if v is not None:
+                bucket[m + "_sum"] = bucket.get(m + "_sum", 0) + v
+                bucket[m + "_n"] = bucket.get(m + "_n", 0) + 1
+
+
+def value(bucket, metric):
+    """A bucket's total for a summed metric, or its mean for an averaged one."""
+    if metric in RECOVERY_AVERAGES:
+        n = bucket.get(metric + "_n")
+        return bucket[metric + "_sum"] / n if n else None
+    return bucket.get(metric)
+
+
+def _apply(docs, user_dir, key, entries, fresh=False):
+    for entry in entries:
+        if not entry.get("date"):
+            continue
+        day_key, week_key, month_key = bucket_keys(entry["date"])
+        for grain, bkey in (("daily", day_key), ("weekly", week_key), ("monthly", month_key)):
+            # Every bucket key starts with its (ISO, for weeks) year.
+            doc = indexes.year_doc(docs, user_dir, _sidecar(grain, bkey[:4]), dict, fresh)
+            add(doc.setdefault(bkey, {}), key, entry)
+
+
+def marker(key):
+    return YEARS_SIDECAR
+
+
+def record(user_dir, key, entries, head):
+    """Fold newly logged entries into the buckets they touch."""
+    docs = {}
+    _apply(docs, user_dir, key, entries)
+    docs[YEARS_SIDECAR] = indexes.years(docs, head)
+    indexes.write(user_dir, docs)
+
+
+def rebuild(user_dir, key=None):
+    """Recreate every stream's buckets from the logs (they share documents)."""
+    with storage.user_lock(user_dir):
+        docs = {}
+        for k in KEYS:
+            _apply(docs, user_dir, k, storage.load(user_dir, k), fresh=True)
+        docs[YEARS_SIDECAR] = indexes.years(docs)
+        indexes.write(user_dir, docs)
+    return docs
+
+
+def _doc(user_dir, name):
+    return indexes.read(user_dir, YEARS_SIDECAR, lambda: rebuild(user_dir), name)
+
+
+def _buckets(user_dir, grain, first=None, last=None):
+    """Buckets of ``grain`` keyed from ``first`` to ``last`` (inclusive, None for open), across years."""
+    buckets = {}
+    for year in _doc(user_dir, YEARS_SIDECAR) or []:
+        if (first and str(year) < first[:4]) or (last and str(year) > last[:4]):
+            continue
+        for bkey, bucket in (_doc(user_dir, _sidecar(grain, year)) or {}).items():
+            if (first is None or bkey >= first) and (last is None or bkey <= last):
+                buckets[bkey] = bucket
+    return dict(sorted(buckets.items()))
+
+
+def weekly(user_dir, since=None):
+    """Weekly buckets from the week of ``since`` (an ISO date; default all) on."""
+    return _buckets(user_dir, "weekly", since and bucket_keys(since)[1])
+
+
+def monthly(user_dir, since=None):
+    """Monthly buckets from the month of ``since`` (an ISO date; default all) on."""
+    return _buckets(user_dir, "monthly", since and bucket_keys(since)[2])
+
+
+def daily(user_dir, since, until=None):
+    """Daily buckets from ``since`` to ``until`` (ISO dates, inclusive)."""
+    return _buckets(user_dir, "daily", since, until or date.today().isoformat())
+
+
+def series(buckets, metric, last=None):
+    """(keys, values) for a metric over buckets in key order, skipping empty ones."""
+    pairs = [(k, value(b, metric)) for k, b in sorted(buckets.items())]
+    pairs = [(k, v) for k, v in pairs if v is not None]
+    if last:
+        pairs = pairs[-last:]
+    return [k for k, _ in pairs], [v for _, v in pairs]
+
+
+def frame(buckets, metrics):
+    """One row per bucket key (index) with a column per metric."""
+    rows = {k: {m: value(b, m) for m in metrics} for k, b in sorted(buckets.items())}
+    return pd.DataFrame.from_dict(rows, orient="index", columns=list(metrics)).dropna(how="all")
@@ -0,0 +1,58 @@
+"""
+Column types for each data stream.
+
+``coerce`` is applied once when a stream is turned into a DataFrame, so pages
+receive typed frames and never re-run ``pd.to_numeric``/``pd.to_datetime``.
+Columns a stream has never logged are left out rather than invented.
+"""
+
+import pandas as pd
+
+SCHEMAS = {
+    "workout": {
+        "date": "datetime", "training_day": "category", "exercise": "category",
+        "sets": "float32", "reps": "float32", "weight": "float32", "volume": "float32",
+        "rpe": "float32",
+    },
+    "pr": {
+        "date": "datetime", "exercise": "category",
+        "best_weight": "float32", "best_reps": "float32",
+    },
+    "body": {
+        "date": "datetime", "bodyweight": "float32", "bodyfat_pct": "float32",
+        "waist": "float32", "chest": "float32", "arms": "float32", "hips": "float32",
+        "lean_mass": "float32",
+    },
+    "nutrition": {
+        "date": "datetime", "calories": "float32", "protein": "float32",
+        "carbs": "float32", "fats": "float32", "water_l": "float32", "fiber": "float32",
+        "est_calories_from_macros": "float32",
+    },
+    "recovery": {
+        "date": "datetime", "sleep_hours": "float32", "stress_level": "float32",
+        "energy_level": "float32", "resting_hr": "float32", "recovery_score": "float32",
+    },
+    "supplement": {
+        "date": "datetime", "creatine": "bool", "vitamin_d": "bool",
+        "omega_3": "bool", "magnesium": "bool", "zinc": "bool",
+    },
+    "hormone": {
+        "date": "datetime", "sunlight_min": "float32", "daily_steps": "float32",
+        "alcohol": "category", "training_status": "category", "sleep_quality": "float32",
+        "energy_libido": "float32", "hormone_health_score": "float32",
+    },
+}
+
+CONVERTERS = {
+    "datetime": lambda s: pd.to_datetime(s, errors="coerce"),
+    "float32":  lambda s: pd.to_numeric(s, errors="coerce").astype("float32"),
+    "category": lambda s: s.astype("category"),
+    "bool":     lambda s: s.fillna(False).astype(bool),
+}
+
+
+def coerce(key, df):
+    for col, kind in SCHEMAS.get(key, {}).items():
+        if col in df.columns:
+            df[col] = CONVERTERS[kind](df[col])
+    return df
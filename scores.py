@@ -0,0 +1,190 @@
+"""
+Composite scores (recovery, hormone health) under versioned formulas.
+
+The formulas are written over whole arrays, so the same code scores one form
+submission or a user's full history in a single pass. Each formula has a
+version in VERSIONS; change a formula and bump its version.
+
+Daily scores are stored per version: ``scores_<key>_v<version>`` lists the
+years that have data, and each ``scores_<key>_v<version>_<year>`` holds, by
+day of year, the sum and count of that day's entry scores (a day shows their
+mean). Pages only read these. Scores of an older version are never read; a
+user's scores at a new version are computed from the logged inputs the first
+time they are needed, or ahead of time for every account with
+``python manage.py rescore``. ``record`` scores new entries on every write
+(from ``recorder``).
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import indexes
+import storage
+
+# Bump a version whenever its formula changes.
+VERSIONS = {"recovery": 1, "hormone": 1}
+
+COLUMNS = {"recovery": "recovery_score", "hormone": "hormone_health_score"}
+
+KEYS = tuple(VERSIONS)
+
+INPUTS = {
+    "recovery": ("sleep_hours", "stress_level", "energy_level", "resting_hr"),
+    "hormone": ("sunlight_min", "daily_steps", "alcohol", "training_status", "sleep_quality", "energy_libido"),
+}
+
+ALCOHOL_POINTS = {"None": 5, "1 drink": 4, "2 drinks": 2, "3+ drinks": 0}
+
+
+def _floats(values):
+    return pd.to_numeric(pd.Series(np.atleast_1d(values)), errors="coerce").to_numpy("float64")
+
+
+def _text(values):
+    return pd.Series(np.atleast_1d(values), dtype="object")
+
+
+def _result(score, scalar):
+    # A single entry is rounded with round(), exactly as the forms always did; arrays stay unrounded.
+    return round(float(score[0]), 1) if scalar else score
+
+
+def recovery_parts(sleep_hours, stress_level, energy_level, resting_hr):
+    """The four 0–5 parts of the recovery score, element-wise: sleep, low stress, energy, heart."""
+    return {
+        "sleep": np.minimum(_floats(sleep_hours) / 9 * 5, 5),
+        "low_stress": 6 - _floats(stress_level),
+        "energy": _floats(energy_level),
+        "heart": np.maximum(0, 5 - (_floats(resting_hr) - 50) / 10),
+    }
+
+
+def recovery(sleep_hours, stress_level, energy_level, resting_hr):
+    """Recovery score (1–5): the mean of ``recovery_parts``. Scalars give a float to one decimal."""
+    parts = recovery_parts(sleep_hours, stress_level, energy_level, resting_hr)
+    # Summed in the order the forms always used, so rounding agrees with scores already logged.
+    total = parts["sleep"] + 6 - _floats(stress_level) + parts["energy"] + parts["heart"]
+    return _result(total / 4, np.ndim(sleep_hours) == 0)
+
+
+def hormone_parts(sunlight_min, daily_steps, alcohol, training_status, sleep_quality, energy_libido):
+    """The six 0–5 parts of the hormone health score, element-wise."""
+    training = _text(training_status).astype(str)
+    return {
+        "sunlight": np.minimum(_floats(sunlight_min) / 60 * 5, 5),
+        "steps": np.minimum(_floats(daily_steps) / 12000 * 5, 5),
+        "alcohol": _text(alcohol).map(ALCOHOL_POINTS).fillna(0).to_numpy("float64"),
+        "training": np.where(training.str.contains("Intense"), 5.0,
+                             np.where(training.str.contains("Moderate"), 4.0, 3.0)),
+        "sleep": _floats(sleep_quality),
+        "drive": _floats(energy_libido),
+    }
+
+
+def hormone(sunlight_min, daily_steps, alcohol, training_status, sleep_quality, energy_libido):
+    """Hormone health score (0–5): the mean of ``hormone_parts``. Scalars give a float to one decimal."""
+    parts = hormone_parts(sunlight_min, daily_steps, alcohol, training_status, sleep_quality, energy_libido)
+    return _result(sum(parts.values()) / 6, np.ndim(sunlight_min) == 0)
+
+
+FORMULAS = {"recovery": recovery, "hormone": hormone}
+
+
+def compute(key, df):
+    """The current formula's score for every row of a stream frame.
+
+    Rows missing an input keep the score they were logged with, if any.
+    """
+    if df.empty:
+        return np.empty(0)
+    args = [df[c] if c in df.columns else np.full(len(df), np.nan) for c in INPUTS[key]]
+    score = np.asarray(FORMULAS[key](*args), dtype="float64")
+    if COLUMNS[key] in df.columns:
+        logged = pd.to_numeric(df[COLUMNS[key]], errors="coerce").to_numpy("float64")
+        score = np.where(np.isnan(score), logged, score)
+    return score
+
+
+def marker(key):
+    return f"scores_{key}_v{VERSIONS[key]}"
+
+
+def _year_name(key, year):
+    return f"{marker(key)}_{year}"
+
+
+def _apply(docs, user_dir, key, df, fresh=False):
+    if df.empty or "date" not in df.columns:
+        return
+    days = pd.to_datetime(df["date"], errors="coerce")
+    score = compute(key, df)
+    ok = days.notna().to_numpy() & ~np.isnan(score)
+    days, score = days[ok], score[ok]
+    head = docs.setdefault(marker(key), {"years": []})
+    for year in np.unique(days.dt.year):
+        name = _year_name(key, int(year))
+        doc = indexes.year_doc(docs, user_dir, name, _empty_year, fresh)
+        in_year = (days.dt.year == year).to_numpy()
+        slots = days.dt.dayofyear.to_numpy()[in_year] - 1
+        total, n = np.array(doc["sum"], dtype="float64"), np.array(doc["n"], dtype="int64")
+        np.add.at(total, slots, score[in_year])
+        np.add.at(n, slots, 1)
+        docs[name] = {"sum": np.round(total, 3).tolist(), "n": n.tolist()}
+        head["years"] = sorted(set(head["years"]) | {int(year)})
+
+
+def _empty_year():
+    return {"sum": [0.0] * indexes.DAY_SLOTS, "n": [0] * indexes.DAY_SLOTS}
+
+
+def record(user_dir, key, entries, head):
+    """Score newly logged entries into their days."""
+    docs = {marker(key): head}
+    _apply(docs, user_dir, key, pd.DataFrame(entries))
+    indexes.write(user_dir, docs)
+
+
+def rebuild(user_dir, key=None):
+    """Score the whole log of ``key`` (default every scored stream) with the current formula."""
+    with storage.user_lock(user_dir):
+        docs = {}
+        for k in [key] if key else KEYS:
+            docs[marker(k)] = {"years": []}
+            # Not schema.coerce: its float32 columns would shift scores sitting on a rounding boundary.
+            _apply(docs, user_dir, k, pd.DataFrame(storage.load(user_dir, k)), fresh=True)
+        indexes.write(user_dir, docs)
+    return docs
+
+
+def current(user_dir, key):
+    """True if the user's stored scores are at the formula's current version."""
+    return storage.read_sidecar(user_dir, marker(key)) is not None
+
+
+def daily(user_dir, key, since, until=None):
+    """Daily mean score from ``since`` to ``until`` (dates) as a ``date``/score frame, logged days only."""
+    until = until or date.today()
+    head = indexes.read(user_dir, marker(key), lambda: rebuild(user_dir, key))
+    docs = {year: storage.read_sidecar(user_dir, _year_name(key, year))
+            for year in head["years"] if since.year <= year <= until.year}
+    empty = _empty_year()
+    total = indexes.window(since, until, lambda year, days: docs.get(year, empty)["sum"][:days])
+    n = indexes.window(since, until, lambda year, days: docs.get(year, empty)["n"][:days])
+    index, total, n = pd.date_range(since, until, freq="D"), total.astype("float64"), n.astype("int64")
+    keep = n > 0
+    return pd.DataFrame({"date": index[keep], COLUMNS[key]: np.round(total[keep] / n[keep], 2)})
+
+
+def latest(user_dir, key, as_of=None, skip=0):
+    """(ISO date, score) of the ``skip``-th scored day back from ``as_of`` (0 = the newest), or None."""
+    as_of = as_of or date.today()
+    head = indexes.read(user_dir, marker(key), lambda: rebuild(user_dir, key))
+    for year in reversed([y for y in head["years"] if y <= as_of.year]):
+        df = daily(user_dir, key, date(year, 1, 1), min(as_of, date(year, 12, 31)))
+        if skip < len(df):
+            row = df.iloc[-1 - skip]
+            return row["date"].date().isoformat(), float(row[COLUMNS[key]])
+        skip -= len(df)
+    return None
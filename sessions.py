@@ -0,0 +1,92 @@
+"""
+Signed, expiring login sessions.
+
+A token is ``<payload>.<signature>``: the payload is URL-safe base64 JSON
+``{"sub": email, "exp": unix_time, "jti": random_id}`` and the signature its
+HMAC-SHA256 under the server secret. Validating one is a signature compare, an
+expiry check and a lookup in the ``revoked_tokens`` table — no bcrypt and no
+user record. Logging out revokes the token's ``jti`` until it would have
+expired anyway.
+
+The secret comes from ``FITNESS_SECRET`` or is generated once into
+``fitness_data/session.key``; replacing it signs everyone out.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+
+import auth
+import storage
+
+KEY_FILE = os.path.join(storage.DATA_DIR, "session.key")
+TTL = int(os.environ.get("FITNESS_SESSION_TTL", 7 * 24 * 3600))
+
+_secret = None
+
+
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def secret():
+    global _secret
+    if _secret is None:
+        env = os.environ.get("FITNESS_SECRET")
+        if env:
+            _secret = env.encode("utf-8")
+        else:
+            with storage.locked(KEY_FILE):
+                if not os.path.exists(KEY_FILE):
+                    os.makedirs(os.path.dirname(KEY_FILE), exist_ok=True)
+                    storage.atomic_write(KEY_FILE, secrets.token_hex(32))
+                    os.chmod(KEY_FILE, 0o600)
+                with open(KEY_FILE) as f:
+                    _secret = f.read().strip().encode("ascii")
+    return _secret
+
+
+def _sign(payload):
+    return _b64(hmac.new(secret(), payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue(email, ttl=None):
+    claims = {"sub": email, "exp": int(time.time()) + (ttl or TTL), "jti": secrets.token_hex(8)}
+    payload = _b64(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}"
+
+
+def claims(token):
+    """The token's claims if it is authentic, unexpired and not revoked, else None."""
+    try:
+        payload, signature = token.split(".")
+        if not hmac.compare_digest(signature, _sign(payload)):
+            return None
+        data = json.loads(_unb64(payload))
+    except (AttributeError, TypeError, ValueError, UnicodeError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    if data.get("exp", 0) < time.time() or auth.registry().is_revoked(data.get("jti", "")):
+        return None
+    return data
+
+
+def validate(token):
+    """The email a valid token was issued to, or None."""
+    data = claims(token)
+    return data["sub"] if data else None
+
+
+def revoke(token):
+    data = claims(token)
+    if data:
+        auth.registry().revoke_token(data["jti"], data["exp"])
@@ -0,0 +1,156 @@
+"""
+Columnar snapshots of each stream for fast cold loads.
+
+``frame`` returns a stream as a typed DataFrame read from a memory-mapped
+Arrow IPC file (``<user_dir>/snapshots/<stream>.arrow``) instead of parsing
+every JSON record. With the ``jsonl`` backend the snapshot remembers the log
+offset it covers, so only lines appended since are parsed and the snapshot is
+rewritten once TAIL_ROWS of them pile up. Other backends rebuild it whenever
+the stream's version changes; that version (a file stat, or the SQLite
+``versions`` row) is stored in the database or on disk, so a write from any
+process or an earlier run is seen. A jsonl snapshot also re-checks the bytes just
+before its offset, so a compacted or replaced log is never mis-read as an
+append.
+
+pyarrow is optional: without it ``frame`` returns None and callers build
+frames from records as before. ``python manage.py export`` writes the same
+files (or Parquet) for every user.
+"""
+
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+import schema
+import storage
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+TAIL_ROWS = 500
+MARK_BYTES = 64
+
+FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+
+
+def available():
+    return pa is not None
+
+
+def path(user_dir, key):
+    return os.path.join(user_dir, "snapshots", storage.STREAMS[key] + ".arrow")
+
+
+def to_frame(key, records):
+    return schema.coerce(key, pd.DataFrame(records)) if records else pd.DataFrame()
+
+
+def write(dest, df, meta=None, fmt="arrow"):
+    """Write a frame as Arrow IPC or Parquet; returns False if it cannot be stored columnar."""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        # e.g. a column holding both numbers and text
+        return False
+    if meta is not None:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                               b"fitness": json.dumps(meta).encode("utf-8")})
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dest) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        if fmt == "parquet":
+            pq.write_table(table, tmp)
+        else:
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, dest)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def read(src):
+    """(frame, meta) from a snapshot, or (None, None) if there is none."""
+    try:
+        with pa.memory_map(src) as source:
+            table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas()
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None, None
+    meta = (table.schema.metadata or {}).get(b"fitness")
+    return df, json.loads(meta) if meta else {}
+
+
+def _append(key, df, tail):
+    """``df`` followed by the rows of ``tail``; only the tail is parsed and typed."""
+    new = to_frame(key, tail)
+    for col in df.columns.intersection(new.columns):
+        a, b = df[col].dtype, new[col].dtype
+        # concat keeps a categorical only when both sides share its categories.
+        if isinstance(a, pd.CategoricalDtype) and isinstance(b, pd.CategoricalDtype) and a != b:
+            dtype = pd.CategoricalDtype(a.categories.union(b.categories))
+            df[col], new[col] = df[col].astype(dtype), new[col].astype(dtype)
+    out = pd.concat([df, new], ignore_index=True)
+    # A column only one side has comes back untyped; re-type just those.
+    kinds = schema.SCHEMAS.get(key, {})
+    for col in df.columns.symmetric_difference(new.columns):
+        if col in kinds:
+            out[col] = schema.CONVERTERS[kinds[col]](out[col])
+    return out
+
+
+def _mark(log, offset):
+    with open(log, "rb") as f:
+        f.seek(max(0, offset - MARK_BYTES))
+        return f.read(offset - max(0, offset - MARK_BYTES)).hex()
+
+
+def _jsonl_frame(backend, user_dir, key):
+    if not backend._ensure(user_dir, key):
+        return pd.DataFrame()
+    dest, log = path(user_dir, key), backend.path(user_dir, key)
+    df, meta = read(dest)
+    offset = meta.get("offset", 0) if df is not None else 0
+    if offset and (offset > os.path.getsize(log) or _mark(log, offset) != meta.get("mark")):
+        df, offset = None, 0
+    tail, end = backend.read_from(user_dir, key, offset)
+    if df is None:
+        df = to_frame(key, tail)
+    elif tail:
+        df = _append(key, df, tail)
+    if (meta is None or len(tail) >= TAIL_ROWS) and end:
+        write(dest, df, {"offset": end, "mark": _mark(log, end)})
+    return df
+
+
+def frame(user_dir, key):
+    """The whole stream as a typed DataFrame, or None when snapshots cannot serve it."""
+    if pa is None or key in storage.KEYED:
+        return None
+    backend = storage.get_backend()
+    if isinstance(backend, storage.JsonlBackend):
+        return _jsonl_frame(backend, user_dir, key)
+    dest = path(user_dir, key)
+    version = json.loads(json.dumps(backend.version(user_dir, key), default=str))
+    df, meta = read(dest)
+    if df is None or meta.get("version") != version:
+        df = to_frame(key, backend.load(user_dir, key))
+        write(dest, df, {"version": version})
+    return df
+
+
+def export(user_dir, out_dir, fmt="arrow"):
+    """Write every stream of a user to ``out_dir``; returns {stream: rows written}."""
+    written = {}
+    for key, name in storage.STREAMS.items():
+        df = to_frame(key, storage.load(user_dir, key))
+        if write(os.path.join(out_dir, name + FORMATS[fmt]), df, fmt=fmt):
+            written[key] = len(df)
+    return written
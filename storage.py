@@ -0,0 +1,516 @@
+"""
+Storage backends for the per-user data streams.
+
+Every stream lives in the user's directory under ``fitness_data/``. The
+default ``jsonl`` backend keeps one JSON record per line so logging an entry
+is a single O(1) append instead of a full read-modify-write of the history.
+Existing ``<stream>.json`` files are migrated the first time they are read.
+
+The ``sqlite`` backend keeps every user's streams in one database
+(``FITNESS_DB``, default ``fitness_data/fitness.db``) indexed on
+``(user, date)`` and ``(user, exercise, date)`` so date-window and exercise
+filters run in SQL. ``python manage.py migrate`` imports existing folders.
+
+Select a backend with ``FITNESS_STORAGE=jsonl|json|sqlite``.
+
+Writers take a per-file lock and whole-file rewrites go through a temp file
+and ``os.replace``, so a reader never sees a half-written file and two tabs
+appending at once cannot lose each other's entries. ``save(..., expect=v)``
+refuses to overwrite a stream whose version moved on since ``v`` was read.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DATA_DIR = "fitness_data"
+
+STREAMS = {
+    "workout":    "workouts",
+    "pr":         "pr_tracker",
+    "body":       "body_metrics",
+    "nutrition":  "nutrition",
+    "recovery":   "recovery",
+    "supplement": "supplements",
+    "hormone":    "hormone",
+}
+
+# Streams where a newer record replaces an older one with the same key.
+KEYED = {"pr": "exercise"}
+
+# Keyed logs are compacted once they hold this many times more lines than keys.
+COMPACT_RATIO = 4
+
+
+class StaleWriteError(Exception):
+    """The stream changed after the caller read it; reload and retry."""
+
+
+def _dump(entry):
+    return json.dumps(entry, default=str)
+
+
+_held = threading.local()
+
+
+@contextmanager
+def locked(path):
+    """Hold an exclusive lock on ``path`` (via ``path.lock``) across processes.
+
+    Re-entrant within a thread, so write paths can nest freely.
+    """
+    held = _held.__dict__.setdefault("paths", set())
+    if path in held:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".lock", "a+") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def folder_for(email):
+    """The data folder of the account with this email (``you@example.com`` → ``fitness_data/you_example_com``)."""
+    return os.path.join(DATA_DIR, email.replace("@", "_").replace(".", "_"))
+
+
+def user_lock(user_dir):
+    """Serialize writers of one user so a log entry and its indexes move together."""
+    return locked(os.path.join(user_dir, "user"))
+
+
+def atomic_write(path, text):
+    """Replace ``path`` with ``text`` so readers see either the old or new file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _stat_version(path):
+    # A stat is enough to tell whether a file changed; nothing is read.
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _filter(records, since=None, until=None, exercise=None):
+    return [r for r in records
+            if (since is None or str(r.get("date", "")) >= str(since))
+            and (until is None or str(r.get("date", "")) <= str(until))
+            and (exercise is None or r.get("exercise") == exercise)]
+
+
+def _fold(key, records):
+    field = KEYED.get(key)
+    if not field:
+        return records
+    latest = {}
+    for r in records:
+        latest[r[field]] = r
+    return list(latest.values())
+
+
+class FileBackend:
+    """Filters for backends that can only read a stream whole.
+
+    Sidecars are small derived documents (indexes, rollups) kept as
+    ``<user_dir>/index/<name>.json`` next to the streams.
+    """
+
+    def sidecar_path(self, user_dir, name):
+        return os.path.join(user_dir, "index", name + ".json")
+
+    def read_sidecar(self, user_dir, name):
+        path = self.sidecar_path(user_dir, name)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def write_sidecar(self, user_dir, name, doc):
+        path = self.sidecar_path(user_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, _dump(doc))
+
+    def _check(self, user_dir, key, expect):
+        if expect is not None and self.version(user_dir, key) != expect:
+            raise StaleWriteError(f"{key} changed since it was read")
+
+    def query(self, user_dir, key, since=None, until=None, exercise=None):
+        return _filter(self.load(user_dir, key), since, until, exercise)
+
+    def exercises(self, user_dir):
+        return sorted({r["exercise"] for r in self.load(user_dir, "workout") if "exercise" in r})
+
+
+class JsonBackend(FileBackend):
+    """The original layout: one indented JSON array per stream."""
+
+    ext = ".json"
+
+    def path(self, user_dir, key):
+        return os.path.join(user_dir, STREAMS[key] + self.ext)
+
+    def load(self, user_dir, key):
+        path = self.path(user_dir, key)
+        if os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+        return []
+
+    def save(self, user_dir, key, data, expect=None):
+        path = self.path(user_dir, key)
+        with locked(path):
+            self._check(user_dir, key, expect)
+            atomic_write(path, json.dumps(data, indent=2, default=str))
+
+    def version(self, user_dir, key):
+        return _stat_version(self.path(user_dir, key))
+
+    def append(self, user_dir, key, entries):
+        path = self.path(user_dir, key)
+        with locked(path):
+            data = _fold(key, self.load(user_dir, key) + list(entries))
+            atomic_write(path, json.dumps(data, indent=2, default=str))
+
+
+class JsonlBackend(FileBackend):
+    """Append-only JSON Lines log with compaction for keyed streams."""
+
+    ext = ".jsonl"
+
+    def path(self, user_dir, key):
+        return os.path.join(user_dir, STREAMS[key] + self.ext)
+
+    def _rewrite(self, path, data):
+        # Callers hold the stream lock.
+        atomic_write(path, "".join(_dump(e) + "\n" for e in data))
+
+    def _ensure(self, user_dir, key):
+        """Migrate a legacy .json file on first touch; returns whether the log exists."""
+        path = self.path(user_dir, key)
+        if os.path.exists(path):
+            return True
+        legacy = JsonBackend().path(user_dir, key)
+        if not os.path.exists(legacy):
+            return False
+        with locked(path):
+            if not os.path.exists(path):
+                self._rewrite(path, JsonBackend().load(user_dir, key))
+                os.replace(legacy, legacy + ".migrated")
+        return True
+
+    def _read(self, path):
+        records = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A crash mid-append can leave a torn final line; skip it.
+                    continue
+        return records
+
+    def read_from(self, user_dir, key, offset=0):
+        """Records in complete lines from byte ``offset`` on, and the offset just past them."""
+        with open(self.path(user_dir, key), "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+        # An append still in flight has no newline yet; leave it for next time.
+        end = chunk.rfind(b"\n") + 1
+        records = []
+        for line in chunk[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return records, offset + end
+
+    def load(self, user_dir, key):
+        path = self.path(user_dir, key)
+        if not self._ensure(user_dir, key):
+            return []
+        records = self._read(path)
+        data = _fold(key, records)
+        if key in KEYED and len(records) > COMPACT_RATIO * max(len(data), 1):
+            self.compact(user_dir, key)
+        return data
+
+    def save(self, user_dir, key, data, expect=None):
+        path = self.path(user_dir, key)
+        with locked(path):
+            self._check(user_dir, key, expect)
+            self._rewrite(path, data)
+
+    def append(self, user_dir, key, entries):
+        path = self.path(user_dir, key)
+        self._ensure(user_dir, key)
+        with locked(path):
+            # One write call per batch; the lock keeps batches from interleaving.
+            with open(path, "a") as f:
+                f.write("".join(_dump(e) + "\n" for e in entries))
+
+    def compact(self, user_dir, key):
+        path = self.path(user_dir, key)
+        with locked(path):
+            # Re-read under the lock so appends since load() are kept.
+            self._rewrite(path, _fold(key, self._read(path)))
+
+    def version(self, user_dir, key):
+        path = self.path(user_dir, key)
+        if not os.path.exists(path):
+            path = JsonBackend().path(user_dir, key)
+        return _stat_version(path)
+
+
+def read_files(user_dir, key):
+    """Read a stream from whichever file layout exists, without migrating it."""
+    jsonl = JsonlBackend()
+    if os.path.exists(jsonl.path(user_dir, key)):
+        return _fold(key, jsonl._read(jsonl.path(user_dir, key)))
+    return JsonBackend().load(user_dir, key)
+
+
+TABLES = {
+    "workout":    "workouts",
+    "pr":         "prs",
+    "body":       "body",
+    "nutrition":  "nutrition",
+    "recovery":   "recovery",
+    "supplement": "supplements",
+    "hormone":    "hormones",
+}
+
+# Streams that carry an exercise column alongside user and date.
+EXERCISE_TABLES = {"workout", "pr"}
+
+
+def _schema():
+    stmts = ["CREATE TABLE IF NOT EXISTS users (email TEXT PRIMARY KEY, data TEXT NOT NULL)"]
+    for key, table in TABLES.items():
+        cols = "id INTEGER PRIMARY KEY, user TEXT NOT NULL, date TEXT"
+        if key in EXERCISE_TABLES:
+            cols += ", exercise TEXT"
+        cols += ", data TEXT NOT NULL"
+        stmts.append(f"CREATE TABLE IF NOT EXISTS {table} ({cols})")
+        stmts.append(f"CREATE INDEX IF NOT EXISTS {table}_user_date ON {table} (user, date)")
+        if key in EXERCISE_TABLES:
+            stmts.append(f"CREATE INDEX IF NOT EXISTS {table}_user_exercise_date ON {table} (user, exercise, date)")
+    stmts.append("CREATE UNIQUE INDEX IF NOT EXISTS prs_user_exercise ON prs (user, exercise)")
+    stmts.append("CREATE TABLE IF NOT EXISTS sidecars (user TEXT NOT NULL, name TEXT NOT NULL, "
+                 "data TEXT NOT NULL, PRIMARY KEY (user, name))")
+    # One counter per (user, stream), bumped in the same transaction as every write to it.
+    stmts.append("CREATE TABLE IF NOT EXISTS versions (user TEXT NOT NULL, stream TEXT NOT NULL, "
+                 "n INTEGER NOT NULL, PRIMARY KEY (user, stream))")
+    stmts.append("CREATE TABLE IF NOT EXISTS revoked_tokens (token_id TEXT PRIMARY KEY, expires INTEGER NOT NULL)")
+    return stmts
+
+
+class SqliteBackend:
+    """All users and streams in one SQLite database."""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.environ.get("FITNESS_DB", os.path.join(DATA_DIR, "fitness.db"))
+        self._local = threading.local()
+
+    def connect(self):
+        # sqlite3 connections cannot be shared across Streamlit's session threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                for stmt in _schema():
+                    conn.execute(stmt)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def user(user_dir):
+        return os.path.basename(os.path.normpath(user_dir))
+
+    def _row(self, user_dir, key, entry):
+        row = [self.user(user_dir), None if entry.get("date") is None else str(entry["date"])]
+        if key in EXERCISE_TABLES:
+            row.append(entry.get("exercise"))
+        row.append(_dump(entry))
+        return row
+
+    def _insert_sql(self, key):
+        cols = "user, date, exercise, data" if key in EXERCISE_TABLES else "user, date, data"
+        marks = ", ".join("?" * len(cols.split(", ")))
+        sql = f"INSERT INTO {TABLES[key]} ({cols}) VALUES ({marks})"
+        if key == "pr":
+            sql += " ON CONFLICT (user, exercise) DO UPDATE SET date = excluded.date, data = excluded.data"
+        return sql
+
+    def query(self, user_dir, key, since=None, until=None, exercise=None):
+        sql = f"SELECT data FROM {TABLES[key]} WHERE user = ?"
+        args = [self.user(user_dir)]
+        if since is not None:
+            sql += " AND date >= ?"
+            args.append(str(since))
+        if until is not None:
+            sql += " AND date <= ?"
+            args.append(str(until))
+        if exercise is not None:
+            sql += " AND exercise = ?"
+            args.append(exercise)
+        rows = self.connect().execute(sql + " ORDER BY id", args)
+        return [json.loads(data) for (data,) in rows]
+
+    def load(self, user_dir, key):
+        return self.query(user_dir, key)
+
+    def _bump(self, conn, user_dir, key):
+        # Same transaction as the write, so every process and connection sees both or neither.
+        conn.execute("INSERT INTO versions (user, stream, n) VALUES (?, ?, 1) "
+                     "ON CONFLICT (user, stream) DO UPDATE SET n = n + 1", (self.user(user_dir), key))
+
+    def save(self, user_dir, key, data, expect=None):
+        conn = self.connect()
+        with conn:
+            if expect is not None:
+                conn.execute("BEGIN IMMEDIATE")
+                if self.version(user_dir, key) != expect:
+                    raise StaleWriteError(f"{key} changed since it was read")
+            conn.execute(f"DELETE FROM {TABLES[key]} WHERE user = ?", (self.user(user_dir),))
+            conn.executemany(self._insert_sql(key), [self._row(user_dir, key, e) for e in data])
+            self._bump(conn, user_dir, key)
+
+    def append(self, user_dir, key, entries):
+        conn = self.connect()
+        with conn:
+            conn.executemany(self._insert_sql(key), [self._row(user_dir, key, e) for e in entries])
+            self._bump(conn, user_dir, key)
+
+    def version(self, user_dir, key):
+        row = self.connect().execute("SELECT n FROM versions WHERE user = ? AND stream = ?",
+                                     (self.user(user_dir), key)).fetchone()
+        return row[0] if row else 0
+
+    def exercises(self, user_dir):
+        rows = self.connect().execute(
+            "SELECT DISTINCT exercise FROM workouts WHERE user = ? ORDER BY exercise", (self.user(user_dir),))
+        return [ex for (ex,) in rows if ex is not None]
+
+    def read_sidecar(self, user_dir, name):
+        row = self.connect().execute(
+            "SELECT data FROM sidecars WHERE user = ? AND name = ?", (self.user(user_dir), name)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def write_sidecar(self, user_dir, name, doc):
+        conn = self.connect()
+        with conn:
+            conn.execute("INSERT INTO sidecars (user, name, data) VALUES (?, ?, ?) "
+                         "ON CONFLICT (user, name) DO UPDATE SET data = excluded.data",
+                         (self.user(user_dir), name, _dump(doc)))
+
+    def get_user(self, email):
+        row = self.connect().execute("SELECT data FROM users WHERE email = ?", (email,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add_user(self, email, record):
+        conn = self.connect()
+        with conn:
+            cur = conn.execute("INSERT OR IGNORE INTO users (email, data) VALUES (?, ?)", (email, _dump(record)))
+        return cur.rowcount == 1
+
+    def update_user(self, email, record):
+        conn = self.connect()
+        with conn:
+            conn.execute("UPDATE users SET data = ? WHERE email = ?", (_dump(record), email))
+
+    def revoke_token(self, token_id, expires):
+        conn = self.connect()
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO revoked_tokens (token_id, expires) VALUES (?, ?)", (token_id, expires))
+            # Expired tokens fail validation anyway; no need to remember them.
+            conn.execute("DELETE FROM revoked_tokens WHERE expires < strftime('%s', 'now')")
+
+    def is_revoked(self, token_id):
+        row = self.connect().execute("SELECT 1 FROM revoked_tokens WHERE token_id = ?", (token_id,)).fetchone()
+        return row is not None
+
+
+BACKENDS = {"json": JsonBackend, "jsonl": JsonlBackend, "sqlite": SqliteBackend}
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = BACKENDS[os.environ.get("FITNESS_STORAGE", "jsonl")]()
+    return _backend
+
+
+def load(user_dir, key):
+    return get_backend().load(user_dir, key)
+
+
+def query(user_dir, key, since=None, until=None, exercise=None):
+    return get_backend().query(user_dir, key, since, until, exercise)
+
+
+def exercises(user_dir):
+    return get_backend().exercises(user_dir)
+
+
+def version(user_dir, key):
+    """A token that changes whenever the stream is written."""
+    return get_backend().version(user_dir, key)
+
+
+def save(user_dir, key, data, expect=None):
+    """Replace a whole stream; with ``expect``, only if its version still matches."""
+    get_backend().save(user_dir, key, data, expect)
+
+
+def append(user_dir, key, *entries):
+    get_backend().append(user_dir, key, entries)
+
+
+def read_sidecar(user_dir, name):
+    """A derived per-user document, or None if it was never written."""
+    return get_backend().read_sidecar(user_dir, name)
+
+
+def write_sidecar(user_dir, name, doc):
+    get_backend().write_sidecar(user_dir, name, doc)
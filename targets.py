@@ -0,0 +1,194 @@
+"""
+Daily nutrition targets from stored data, and adherence to them.
+
+A user's goals are kept in the ``nutrition_targets`` sidecar as dated
+periods: each one holds the settings from its ``from`` date until the next
+period starts, so changing a goal never rewrites past targets. For each day:
+
+- calories = trend bodyweight × ``kcal_per_kg`` + the goal's adjustment
+  (GOALS), plus ``training_kcal`` on days with logged sets;
+- protein = trend bodyweight × ``protein_per_kg``;
+- water = ``water_l``, plus ``training_water_l`` on training days.
+
+Before the first bodyweight the fixed ``calories``/``protein`` are used.
+Bodyweight is the EMA from ``trends``; daily intake and training days come
+from the ``facts`` table, so nothing re-reads the logs.
+
+``summary`` scores the latest logged day and the current week and month with
+array operations over the whole window. Results are cached until a
+nutrition, body or workout entry is saved or the goals change.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+import facts
+import storage
+import trends
+
+SIDECAR = "nutrition_targets"
+
+GOALS = {"cut": -500, "maintain": 0, "bulk": 300}
+
+DEFAULTS = {
+    "goal": "maintain", "kcal_per_kg": 33.0, "protein_per_kg": 2.0, "training_kcal": 250.0,
+    "water_l": 3.5, "training_water_l": 0.5, "calories": 2500.0, "protein": 180.0,
+}
+
+METRICS = {"calories": "calories", "protein": "protein", "water": "water_l"}
+
+# Settings that must be above zero; the training extras may be zero.
+POSITIVE = ("kcal_per_kg", "protein_per_kg", "water_l", "calories", "protein")
+
+# A day counts as on target with calories within this fraction and protein and water at least 1 - it.
+TOLERANCE = 0.1
+
+# Streams whose writes change targets or intake; a new version of any drops the cached results.
+STREAMS = ("nutrition", "body", "workout")
+
+CACHE_SIZE = 256
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def periods(user_dir):
+    """Goal periods in date order, each ``{"from": ISO date, **settings}``."""
+    doc = storage.read_sidecar(user_dir, SIDECAR)
+    return doc["periods"] if doc else []
+
+
+def current(user_dir, day=None):
+    """The settings in effect on ``day`` (default today)."""
+    day = (day or date.today()).isoformat()
+    active = [p for p in periods(user_dir) if p["from"] <= day]
+    return {**DEFAULTS, **(active[-1] if active else {})}
+
+
+def set_goals(user_dir, start=None, **settings):
+    """Start a new goal period on ``start`` (default today); one on the same day is replaced."""
+    unknown = set(settings) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"unknown target settings: {', '.join(sorted(unknown))}")
+    if settings.get("goal", "maintain") not in GOALS:
+        raise ValueError(f"goal must be one of {', '.join(GOALS)}")
+    for name, value in settings.items():
+        if name != "goal" and not (value > 0 if name in POSITIVE else value >= 0):
+            raise ValueError(f"{name} must be {'above' if name in POSITIVE else 'at least'} 0, got {value}")
+    start = (start or date.today()).isoformat()
+    with storage.user_lock(user_dir):
+        items = [p for p in periods(user_dir) if p["from"] != start]
+        items.append({"from": start, **{k: v for k, v in current(user_dir, date.fromisoformat(start)).items()
+                                        if k != "from"}, **settings})
+        storage.write_sidecar(user_dir, SIDECAR, {"periods": sorted(items, key=lambda p: p["from"])})
+
+
+def _settings(user_dir, index):
+    """Each setting as an array over ``index``, taken from the period in effect that day."""
+    items = periods(user_dir)
+    starts = pd.to_datetime([p["from"] for p in items]).to_numpy(dtype="datetime64[ns]")
+    which = np.searchsorted(starts, index.to_numpy(dtype="datetime64[ns]"), side="right") - 1
+    rows = [DEFAULTS] + [{**DEFAULTS, **p} for p in items]
+    out = {}
+    for name, default in DEFAULTS.items():
+        values = [GOALS[r[name]] if name == "goal" else float(r[name]) for r in rows]
+        out[name] = np.asarray(values)[which + 1]
+    return out
+
+
+def daily(user_dir, since, until=None):
+    """Targets, intake and adherence for each day from ``since`` to ``until`` (dates).
+
+    Columns: ``<metric>``, ``<metric>_target`` and ``<metric>_pct`` for calories,
+    protein and water, ``training``, ``adherence`` (mean of the percentages) and
+    ``on_target``. Intake and scores are NaN on days without a nutrition log.
+    """
+    until = until or date.today()
+    day_facts = facts.frame(user_dir, since, until)
+    index = day_facts.index
+    weight = trends.frame(user_dir, "body", "bodyweight").set_index("date")["bodyweight"]
+    bw = weight.reindex(weight.index.union(index)).ffill().reindex(index).to_numpy(dtype="float64")
+    s = _settings(user_dir, index)
+    training = (day_facts["sets"].fillna(0) > 0).to_numpy()
+
+    known = ~np.isnan(bw)
+    targets = {
+        "calories": np.round(np.where(known, bw * s["kcal_per_kg"] + s["goal"], s["calories"])
+                             + training * s["training_kcal"], -1),
+        "protein": np.round(np.where(known, bw * s["protein_per_kg"], s["protein"])),
+        "water": np.round(s["water_l"] + training * s["training_water_l"], 1),
+    }
+    out = {"training": training}
+    logged = day_facts["calories"].notna().to_numpy()
+    for metric, column in METRICS.items():
+        actual = day_facts[column].to_numpy(dtype="float64")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(targets[metric] > 0, actual / targets[metric], np.nan)
+        if metric == "calories":
+            # Over- and under-eating both count against the calorie target.
+            pct = np.clip(100 - np.abs(ratio - 1) * 100, 0, 100)
+        else:
+            pct = np.minimum(ratio * 100, 100)
+        out[metric] = np.where(logged, actual, np.nan)
+        out[f"{metric}_target"] = targets[metric]
+        out[f"{metric}_pct"] = np.where(logged, pct, np.nan)
+    df = pd.DataFrame(out, index=index)
+    pct = df[[f"{m}_pct" for m in METRICS]]
+    df["adherence"] = pct.mean(axis=1)
+    # A zero target (from goals saved before set_goals checked them) has no score and never fails a day.
+    met = (pct.fillna(0) >= 100 * (1 - TOLERANCE)).to_numpy() | (df[[f"{m}_target" for m in METRICS]] <= 0).to_numpy()
+    df["on_target"] = np.where(logged, met.all(axis=1), False)
+    return df
+
+
+def _period(df):
+    logged = df[df["calories"].notna()]
+    if logged.empty:
+        return None
+    return {
+        "adherence": round(float(logged["adherence"].mean()), 1),
+        **{m: round(float(logged[f"{m}_pct"].mean()), 1) for m in METRICS},
+        "on_target": int(logged["on_target"].sum()),
+        "days": len(logged),
+    }
+
+
+def _compute(user_dir, today):
+    week_start = today - timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
+    df = daily(user_dir, min(week_start, month_start) - timedelta(days=31), today)
+    logged = df.index[df["calories"].notna()]
+    last = logged[-1] if len(logged) else None
+    return {
+        "date": last.date().isoformat() if last is not None else None,
+        "latest": df.loc[last].to_dict() if last is not None else None,
+        "today": df.iloc[-1].to_dict(),
+        "day": _period(df.loc[[last]]) if last is not None else None,
+        "week": _period(df[df.index >= pd.Timestamp(week_start)]),
+        "month": _period(df[df.index >= pd.Timestamp(month_start)]),
+    }
+
+
+def summary(user_dir, today=None):
+    """Targets and adherence for the latest logged day, this week and this month.
+
+    ``latest`` is that day's row of ``daily``, ``today`` today's (its targets
+    are set even before anything is logged); ``day``/``week``/``month`` hold
+    mean percentages, days on target and days logged.
+    """
+    today = today or date.today()
+    key = (user_dir, today, tuple(storage.version(user_dir, s) for s in STREAMS), str(periods(user_dir)))
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    result = _compute(user_dir, today)
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
@@ -0,0 +1,172 @@
+"""
+Smoothed trends for the body, nutrition and recovery streams, kept up to date on write.
+
+Each metric keeps a small running state in the ``trends_<key>`` sidecar: an
+exponential moving average (EMA) of its daily values, plus that metric's daily
+values for the last WINDOW_DAYS days. A logged entry updates the state in
+O(1). The 7/28-day means and the weekly rate of change (a least-squares
+slope) are read from that bounded window, so they never touch the history.
+
+The EMA at each day is kept in ``trends_<key>_<year>`` sidecars,
+``{day: {metric: ema}}``, which the charts draw as trend overlays. An entry
+dated before the newest one cannot be folded in incrementally; the stream's
+trends are rebuilt from its log instead (``python manage.py rebuild-trends``).
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+import indexes
+import storage
+
+METRICS = {
+    "body": ("bodyweight", "bodyfat_pct", "lean_mass"),
+    "nutrition": ("calories", "protein"),
+    "recovery": ("recovery_score", "sleep_hours", "resting_hr"),
+}
+
+KEYS = tuple(METRICS)
+
+# How several entries on one day combine into the day's value.
+DAILY = {"body": "mean", "nutrition": "sum", "recovery": "mean"}
+
+# Weight of a new day in the EMA; a gap of n days decays the old value n times.
+ALPHA = 0.1
+
+WINDOW_DAYS = 28
+
+
+def _ema(prev, prev_day, day, x):
+    if prev is None:
+        return x
+    gap = max((date.fromisoformat(day) - date.fromisoformat(prev_day)).days, 1)
+    return prev + (1 - (1 - ALPHA) ** gap) * (x - prev)
+
+
+def empty():
+    return {"metrics": {}, "years": []}
+
+
+def add(state, series_docs, key, entry):
+    """Fold one entry into the state. Returns False if it is older than the newest day."""
+    day = str(entry.get("date", ""))[:10]
+    if not day:
+        return True
+    for metric in METRICS[key]:
+        v = indexes.num(entry.get(metric))
+        if v is None:
+            continue
+        m = state["metrics"].setdefault(metric, {"day": None, "ema": None, "prev_day": None,
+                                                 "prev_ema": None, "window": {}})
+        if m["day"] is not None and day < m["day"]:
+            return False
+        if day != m["day"]:
+            m["prev_day"], m["prev_ema"], m["day"] = m["day"], m["ema"], day
+        total, n = m["window"].get(day, (0.0, 0))
+        m["window"][day] = (total + v, n + 1)
+        total, n = m["window"][day]
+        m["ema"] = round(_ema(m["prev_ema"], m["prev_day"], day, total if DAILY[key] == "sum" else total / n), 3)
+        oldest = (date.fromisoformat(day) - timedelta(days=WINDOW_DAYS - 1)).isoformat()
+        for d in [d for d in m["window"] if d < oldest]:
+            del m["window"][d]
+        series_docs.setdefault(day[:4], {}).setdefault(day, {})[metric] = m["ema"]
+    return True
+
+
+def marker(key):
+    return f"trends_{key}"
+
+
+def _write(user_dir, key, state, series_docs, fresh=False):
+    docs = {}
+    for year, doc in series_docs.items():
+        name = f"trends_{key}_{year}"
+        if not fresh:
+            stored = storage.read_sidecar(user_dir, name) or {}
+            for day, values in doc.items():
+                stored.setdefault(day, {}).update(values)
+            doc = stored
+        storage.write_sidecar(user_dir, name, doc)
+        docs[name] = doc
+    state["years"] = sorted(set(state["years"]) | set(series_docs))
+    storage.write_sidecar(user_dir, marker(key), state)
+    docs[marker(key)] = state
+    return docs
+
+
+def record(user_dir, key, entries, head):
+    """Fold newly logged entries into the trend state."""
+    series_docs = {}
+    for entry in entries:
+        if not add(head, series_docs, key, entry):
+            rebuild(user_dir, key)
+            return
+    _write(user_dir, key, head, series_docs)
+
+
+def rebuild(user_dir, key=None):
+    """Recreate the trend state and series of ``key`` (default every stream) from the logs."""
+    docs = {}
+    with storage.user_lock(user_dir):
+        for k in [key] if key else KEYS:
+            state, series_docs = empty(), {}
+            records = sorted((r for r in storage.load(user_dir, k) if r.get("date")), key=lambda r: str(r["date"]))
+            for entry in records:
+                add(state, series_docs, k, entry)
+            docs.update(_write(user_dir, k, state, series_docs, fresh=True))
+    return docs
+
+
+def load(user_dir, key):
+    return indexes.read(user_dir, marker(key), lambda: rebuild(user_dir, key))
+
+
+def stats(state, key, metric, today=None):
+    """EMA, 7/28-day means and least-squares change per week for one metric, or None."""
+    m = state["metrics"].get(metric)
+    if not m or m["ema"] is None:
+        return None
+    today = today or date.today()
+    ages = np.array([(today - date.fromisoformat(d)).days for d in m["window"]], dtype="int64")
+    values = np.array([t if DAILY[key] == "sum" else t / n for t, n in m["window"].values()], dtype="float64")
+    month, week = ages < WINDOW_DAYS, ages < 7
+    slope = None
+    if month.sum() >= 3:
+        # Days before today run negative, so a rising metric has a positive slope.
+        slope = round(float(np.polyfit(-ages[month], values[month], 1)[0]) * 7, 2) + 0.0
+    return {
+        "ema": m["ema"],
+        "mean_7": round(float(values[week].mean()), 2) if week.any() else None,
+        "mean_28": round(float(values[month].mean()), 2) if month.any() else None,
+        "per_week": slope,
+    }
+
+
+def frame(user_dir, key, metric, since=None):
+    """The EMA trend of a metric as a ``date``/``metric`` frame, from ``since`` (ISO date) on."""
+    state = load(user_dir, key)
+    points = {}
+    for year in state["years"]:
+        if since and year < since[:4]:
+            continue
+        for day, values in (storage.read_sidecar(user_dir, f"trends_{key}_{year}") or {}).items():
+            if metric in values and (since is None or day >= since):
+                points[day] = values[metric]
+    days = sorted(points)
+    return pd.DataFrame({"date": pd.to_datetime(days), metric: [points[d] for d in days]})
+
+
+def caption(user_dir, key, metric, unit):
+    """One line of trend text for a metric, e.g. "Trend 81.2 kg · -0.4 kg/week · 7d 81.5 · 28d 82.0"."""
+    st = stats(load(user_dir, key), key, metric)
+    if st is None:
+        return ""
+    parts = [f"Trend {st['ema']:,.1f} {unit}"]
+    if st["per_week"] is not None:
+        parts.append(f"{st['per_week']:+,.2f} {unit}/week")
+    for label, k in (("7d", "mean_7"), ("28d", "mean_28")):
+        if st[k] is not None:
+            parts.append(f"{label} {st[k]:,.1f}")
+    return " · ".join(parts)
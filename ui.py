@@ -0,0 +1,170 @@
+"""
+Shared look and feel: global CSS, header, chart layout and metric cards.
+"""
+
+import plotly.express as px
+import streamlit as st
+
+# ─────────────────────────────────────────────
+# GLOBAL STYLES  (mobile-first responsive)
+# ─────────────────────────────────────────────
+CSS = """
+<style>
+/* ── Base ── */
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700;900&display=swap');
+
+html, body, [class*="css"] { font-family: 'Inter', sans-serif; }
+
+/* dark background */
+.stApp { background: #0d0f14; color: #e8eaf0; }
+
+/* ── Nav pill tabs ── */
+div[data-testid="stHorizontalBlock"] { gap: 6px !important; }
+
+/* ── Metric cards ── */
+.metric-card {
+    background: linear-gradient(135deg, #1a1d2e 0%, #12151f 100%);
+    border: 1px solid #2a2d3e;
+    border-radius: 16px;
+    padding: 18px 20px;
+    margin-bottom: 12px;
+    box-shadow: 0 4px 20px rgba(0,0,0,0.3);
+}
+.metric-card h3 { margin: 0 0 4px; font-size: 0.78rem; color: #7c8db5; text-transform: uppercase; letter-spacing: 1px; }
+.metric-card .value { font-size: 2rem; font-weight: 900; color: #fff; line-height: 1.1; }
+.metric-card .delta { font-size: 0.8rem; margin-top: 4px; }
+.delta-up   { color: #4ade80; }
+.delta-down { color: #f87171; }
+
+/* ── Section headers ── */
+.section-header {
+    font-size: 1.3rem; font-weight: 700; color: #c7d2fe;
+    border-left: 4px solid #6366f1; padding-left: 12px;
+    margin: 24px 0 16px;
+}
+
+/* ── Pill tag ── */
+.pill {
+    display: inline-block; padding: 3px 12px; border-radius: 999px;
+    font-size: 0.75rem; font-weight: 600; margin: 2px;
+}
+.pill-green  { background:#14532d; color:#4ade80; }
+.pill-blue   { background:#1e3a5f; color:#60a5fa; }
+.pill-purple { background:#2e1065; color:#c084fc; }
+.pill-orange { background:#431407; color:#fb923c; }
+
+/* ── Form containers ── */
+.form-box {
+    background: #13161f;
+    border: 1px solid #252838;
+    border-radius: 14px;
+    padding: 20px;
+    margin-bottom: 20px;
+}
+
+/* ── PR badge ── */
+.pr-badge {
+    background: linear-gradient(135deg,#7c3aed,#4f46e5);
+    border-radius: 12px; padding: 14px 18px;
+    margin-bottom: 10px; display: flex; justify-content: space-between;
+    align-items: center;
+}
+.pr-badge .ex { font-weight: 700; font-size: 1rem; }
+.pr-badge .stats { font-size: 0.85rem; color: #c4b5fd; text-align: right; }
+
+/* ── Table ── */
+.dataframe thead th { background: #1a1d2e !important; color: #a5b4fc !important; }
+.dataframe tbody tr:nth-child(even) { background: #12151f !important; }
+
+/* ── Plotly charts ── */
+.js-plotly-plot { border-radius: 12px; overflow: hidden; }
+
+/* ── Streamlit tweaks ── */
+.stSelectbox > div > div { background: #13161f !important; border-color: #2a2d3e !important; }
+.stTextInput > div > div { background: #13161f !important; border-color: #2a2d3e !important; }
+.stNumberInput > div > div { background: #13161f !important; border-color: #2a2d3e !important; }
+.stTextArea > div > div { background: #13161f !important; border-color: #2a2d3e !important; }
+.stButton > button {
+    background: linear-gradient(135deg,#6366f1,#4f46e5) !important;
+    color: white !important; border: none !important;
+    border-radius: 10px !important; font-weight: 600 !important;
+    padding: 10px 20px !important; width: 100%;
+}
+.stButton > button:hover { opacity: 0.9; transform: translateY(-1px); }
+div[data-testid="stSlider"] .rc-slider-handle { background:#6366f1 !important; border-color:#6366f1 !important; }
+div[data-testid="stSlider"] .rc-slider-track { background:#6366f1 !important; }
+
+/* ── Mobile responsive ── */
+@media (max-width: 768px) {
+    .metric-card .value { font-size: 1.5rem; }
+    .section-header { font-size: 1.1rem; }
+    .pr-badge { flex-direction: column; gap: 6px; }
+}
+</style>
+"""
+
+HEADER = """
+<div style="text-align:center; padding: 10px 0 20px;">
+    <div style="font-size:2rem; font-weight:900; background: linear-gradient(135deg,#6366f1,#a78bfa,#38bdf8);
+        -webkit-background-clip:text; -webkit-text-fill-color:transparent; line-height:1.1;">
+        🏋️ ELITE FITNESS OS
+    </div>
+    <div style="color:#7c8db5; font-size:0.85rem; margin-top:4px;">
+        Progressive Overload · Body Recomposition · Longevity
+    </div>
+</div>
+"""
+
+
+def chrome():
+    # Streamlit drops any element a rerun does not emit, so the styles and header
+    # are re-sent every run; the strings themselves are built once at import.
+    st.markdown(CSS, unsafe_allow_html=True)
+    st.markdown(HEADER, unsafe_allow_html=True)
+
+
+# ═══════════════════════════════════════════════════════════
+# HELPERS
+# ═══════════════════════════════════════════════════════════
+CHART_LAYOUT = dict(
+    paper_bgcolor="#0d0f14", plot_bgcolor="#0d0f14",
+    font_color="#e8eaf0", margin=dict(l=10, r=10, t=30, b=10),
+    legend=dict(bgcolor="#13161f", bordercolor="#2a2d3e"),
+    xaxis=dict(gridcolor="#1e2133", zerolinecolor="#1e2133"),
+    yaxis=dict(gridcolor="#1e2133", zerolinecolor="#1e2133"),
+)
+
+COLORS = ["#6366f1", "#38bdf8", "#4ade80", "#f87171", "#fb923c", "#c084fc", "#facc15"]
+
+# Date ranges for long time-series charts, in days (None = full history).
+RANGES = {"30D": 30, "90D": 90, "1Y": 365, "All": None}
+
+
+def range_picker(key):
+    """Range selector for a chart; returns the number of days, or None for all."""
+    return RANGES[st.radio("🔎 Range", list(RANGES), index=len(RANGES) - 1, horizontal=True, key=key)]
+
+
+def sparkline(df, col, title="", color="#6366f1"):
+    if df.empty or col not in df.columns:
+        return None
+    fig = px.line(df, y=col, color_discrete_sequence=[color])
+    fig.update_traces(line_width=2, fill="tozeroy",
+                      fillcolor=f"rgba{tuple(list(px.colors.hex_to_rgb(color)) + [0.1])}")
+    fig.update_layout(**CHART_LAYOUT, height=80, showlegend=False,
+                      xaxis=dict(visible=False), yaxis=dict(visible=False))
+    return fig
+
+
+def card(title, value, unit="", delta=None, color="#6366f1"):
+    delta_html = ""
+    if delta is not None:
+        cls = "delta-up" if delta >= 0 else "delta-down"
+        arrow = "▲" if delta >= 0 else "▼"
+        delta_html = f'<div class="delta {cls}">{arrow} {abs(delta):.1f} {unit}</div>'
+    st.markdown(f"""
+    <div class="metric-card" style="border-top: 3px solid {color}">
+        <h3>{title}</h3>
+        <div class="value">{value}<span style="font-size:0.9rem;color:#7c8db5;font-weight:500"> {unit}</span></div>
+        {delta_html}
+    </div>""", unsafe_allow_html=True)
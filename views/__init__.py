@@ -0,0 +1,25 @@
+"""
+One module per page, imported only when that page is first opened.
+
+Each page module exposes ``render()`` and a ``STREAMS`` dict naming the data
+streams it reads and the columns it needs from each (``None`` for all).
+"""
+
+import importlib
+
+PAGES = {
+    "📊 Dashboard":   "views.dashboard",
+    "🏋️ Workout":     "views.workout",
+    "🏆 PRs":         "views.prs",
+    "📏 Body":        "views.body",
+    "🥗 Nutrition":   "views.nutrition",
+    "😴 Recovery":    "views.recovery",
+    "💊 Supplements": "views.supplements",
+    "🧬 Hormones":    "views.hormones",
+    "🔗 Insights":    "views.insights",
+    "📥 Import":      "views.imports",
+}
+
+
+def render(page):
+    importlib.import_module(PAGES[page]).render()
@@ -0,0 +1,99 @@
+"""
+📏 Body — measurements and composition trends.
+"""
+
+from datetime import date
+
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.subplots import make_subplots
+
+import data
+import downsample
+import figures
+import trends
+from ui import CHART_LAYOUT, card, range_picker
+
+STREAMS = {"body": None}
+
+MAX_POINTS = 400
+
+
+def render():
+    st.markdown('<div class="section-header">📏 Body Metrics</div>', unsafe_allow_html=True)
+
+    with st.form("body_form"):
+        st.markdown('<div class="form-box">', unsafe_allow_html=True)
+        b_date = st.date_input("📅 Date", value=date.today())
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            b_bw   = st.number_input("⚖️ Bodyweight (kg)", min_value=30.0, max_value=250.0, value=80.0, step=0.1)
+            b_bf   = st.number_input("🧬 Bodyfat %", min_value=3.0, max_value=60.0, value=20.0, step=0.5)
+        with c2:
+            b_waist = st.number_input("📐 Waist (cm)", min_value=40.0, max_value=200.0, value=85.0, step=0.5)
+            b_chest = st.number_input("💪 Chest (cm)", min_value=50.0, max_value=200.0, value=100.0, step=0.5)
+        with c3:
+            b_arms  = st.number_input("💪 Arms (cm)", min_value=20.0, max_value=80.0, value=38.0, step=0.5)
+            b_hips  = st.number_input("📏 Hips (cm)", min_value=50.0, max_value=200.0, value=95.0, step=0.5)
+        b_notes = st.text_area("📝 Notes", placeholder="Conditions, time of day, etc.", height=70)
+        st.markdown('</div>', unsafe_allow_html=True)
+        if st.form_submit_button("💾 Save Metrics"):
+            entry = {
+                "date": str(b_date), "bodyweight": b_bw, "bodyfat_pct": b_bf,
+                "waist": b_waist, "chest": b_chest, "arms": b_arms, "hips": b_hips,
+                "lean_mass": round(b_bw * (1 - b_bf / 100), 1),
+                "notes": b_notes
+            }
+            data.append("body", entry)
+            st.success("✅ Body metrics saved!")
+
+    bdf = data.to_df("body")
+    if not bdf.empty:
+        bdf = bdf.sort_values("date")
+
+        # Composition chart, thinned to MAX_POINTS per metric; a range shows more detail
+        days = range_picker("body_range")
+        since = data.days_ago(days) if days else None
+        cdf = bdf if since is None else bdf[bdf["date"] >= since]
+        user_dir = data.get_user_dir()
+        figures.show("body", "body.composition", lambda: _composition_fig(cdf, user_dir, since), since)
+
+        # Latest measurements
+        latest = bdf.iloc[-1]
+        c1, c2, c3, c4 = st.columns(4)
+        with c1: card("⚖️ Bodyweight", latest.get("bodyweight","–"), "kg", color="#6366f1")
+        with c2: card("🧬 Bodyfat", latest.get("bodyfat_pct","–"), "%", color="#f87171")
+        with c3: card("💪 Lean Mass", latest.get("lean_mass","–"), "kg", color="#4ade80")
+        with c4: card("📐 Waist", latest.get("waist","–"), "cm", color="#fb923c")
+        for metric, label, unit in (("bodyweight", "⚖️ Bodyweight", "kg"), ("lean_mass", "💪 Lean mass", "kg")):
+            line = trends.caption(user_dir, "body", metric, unit)
+            if line:
+                st.caption(f"{label}: {line}")
+
+        st.dataframe(bdf.sort_values("date", ascending=False).head(20),
+                     use_container_width=True, hide_index=True)
+    else:
+        st.info("No body data yet. Log your first measurement!")
+
+
+def _composition_fig(bdf, user_dir, since):
+    fig = make_subplots(rows=2, cols=2,
+                        subplot_titles=["⚖️ Bodyweight", "🧬 Bodyfat %", "💪 Lean Mass", "📐 Waist"])
+    metrics_plot = [("bodyweight","#6366f1"), ("bodyfat_pct","#f87171"),
+                    ("lean_mass","#4ade80"), ("waist","#fb923c")]
+    positions = [(1,1),(1,2),(2,1),(2,2)]
+    for (m, c), (r, col_) in zip(metrics_plot, positions):
+        if m in bdf.columns:
+            pts = downsample.points(bdf, "date", m, MAX_POINTS)
+            if m not in trends.METRICS["body"]:
+                fig.add_trace(go.Scatter(x=pts["date"], y=pts[m],
+                                         mode="lines+markers", name=m, line_color=c, line_width=2), row=r, col=col_)
+                continue
+            # Raw readings as faint dots under the smoothed trend line.
+            fig.add_trace(go.Scatter(x=pts["date"], y=pts[m], mode="markers", name=m,
+                                     marker_color=c, marker_size=5, opacity=0.4), row=r, col=col_)
+            trend = downsample.points(trends.frame(user_dir, "body", m, since), "date", m, MAX_POINTS)
+            fig.add_trace(go.Scatter(x=trend["date"], y=trend[m], mode="lines", name=f"{m} trend",
+                                     line_color=c, line_width=2.5), row=r, col=col_)
+    fig.update_layout(**CHART_LAYOUT, height=500, showlegend=False)
+    return fig
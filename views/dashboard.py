@@ -0,0 +1,145 @@
+"""
+📊 Dashboard — today's snapshot plus the headline trends.
+
+The top cards and the recovery radar read each metric's newest value by date
+from the ``asof`` sidecars, so a backfilled day never shows as today's and no
+history is loaded.
+Charts go through the figure cache and are rebuilt only after a write.
+"""
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import asof
+import compliance
+import data
+import figures
+import rollups
+import scores
+from ui import CHART_LAYOUT, card
+
+# Nutrition and volume charts read the rollups sidecars, not the streams.
+STREAMS = {"body": ["date", "bodyweight"]}
+
+
+def render():
+    user_dir = data.get_user_dir()
+    st.markdown('<div class="section-header">📅 Today at a Glance</div>', unsafe_allow_html=True)
+
+    # Newest reading of each metric by date, so backfilled days never show as "latest"
+    nutrition = asof.snapshot(user_dir, "nutrition")
+    recovery = asof.snapshot(user_dir, "recovery")
+    hormone = asof.snapshot(user_dir, "hormone")
+
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        bw = asof.value(user_dir, "body", "bodyweight")
+        prev = asof.previous(user_dir, "body", "bodyweight")
+        delta_bw = float(bw[1]) - float(prev[1]) if bw and prev else None
+        card("⚖️ Bodyweight", bw[1] if bw else "–", "kg", delta_bw, "#6366f1")
+    with c2:
+        card("🔥 Calories", nutrition.get("calories", "–"), "kcal", color="#f87171")
+    with c3:
+        card("🥩 Protein", nutrition.get("protein", "–"), "g", color="#4ade80")
+    with c4:
+        card("😴 Sleep", recovery.get("sleep_hours", "–"), "hrs", color="#38bdf8")
+
+    c5, c6, c7, c8 = st.columns(4)
+    with c5:
+        card("👟 Steps", hormone.get("daily_steps", "–"), "", color="#fb923c")
+    with c6:
+        card("💧 Water", nutrition.get("water_l", "–"), "L", color="#38bdf8")
+    with c7:
+        card("🧠 Stress", recovery.get("stress_level", "–"), "/5", color="#f87171")
+    with c8:
+        card("⚡ Energy", recovery.get("energy_level", "–"), "/5", color="#facc15")
+
+    # Supplement checklist today
+    st.markdown('<div class="section-header">💊 Supplement Status</div>', unsafe_allow_html=True)
+    today_supps = compliance.today(user_dir) if user_dir else None
+    if today_supps:
+        items = [s for s in compliance.active(user_dir) if s["key"] in today_supps]
+        cols_ = st.columns(len(items) or 1)
+        for i, s in enumerate(items):
+            icon = "✅" if today_supps[s["key"]] else "❌"
+            cols_[i].markdown(f"<div style='text-align:center'>{icon}<br><small>{s['label'].split(' ', 1)[1]}</small></div>",
+                              unsafe_allow_html=True)
+    else:
+        st.info("No supplement log yet today. Go to 💊 Supplements to log.")
+
+    # Charts
+    st.markdown('<div class="section-header">📈 Trends</div>', unsafe_allow_html=True)
+    col_l, col_r = st.columns(2)
+
+    with col_l:
+        if not figures.show("body", "dashboard.bodyweight", _bodyweight_fig):
+            st.info("No body data yet.")
+
+    with col_r:
+        since = data.days_ago(14)
+        if not figures.show("nutrition", "dashboard.nutrition", lambda: _nutrition_fig(user_dir, since), since):
+            st.info("No nutrition data yet.")
+
+    # Workout volume from the ISO-week / month rollups
+    grain = st.radio("📦 Volume by", ["Week", "Month"], horizontal=True, key="volume_grain")
+    figures.show("workout", "dashboard.volume", lambda: _volume_fig(user_dir, grain), grain)
+
+    # Recovery radar
+    if recovery:
+        figures.show("recovery", "dashboard.radar", lambda: _radar_fig(recovery))
+
+
+def _bodyweight_fig():
+    bdf = data.to_df("body", columns=STREAMS["body"])
+    if bdf.empty or "bodyweight" not in bdf:
+        return None
+    fig = px.line(bdf.sort_values("date"), x="date", y="bodyweight",
+                  title="⚖️ Bodyweight", color_discrete_sequence=["#6366f1"])
+    fig.update_traces(line_width=2.5, mode="lines+markers", marker_size=5)
+    fig.update_layout(**CHART_LAYOUT, height=280)
+    return fig
+
+
+def _nutrition_fig(user_dir, since):
+    ndf2 = rollups.frame(rollups.daily(user_dir, since), ["calories", "protein"])
+    if ndf2.empty:
+        return None
+    ndf2.index = pd.to_datetime(ndf2.index)
+    fig2 = px.bar(ndf2, x=ndf2.index, y=["calories", "protein"],
+                  title="🥗 Nutrition (last 14 days)", barmode="overlay",
+                  color_discrete_sequence=["#f87171", "#4ade80"])
+    fig2.update_layout(**CHART_LAYOUT, height=280)
+    return fig2
+
+
+def _volume_fig(user_dir, grain):
+    # A year back covers the last 12 periods without reading older years.
+    since = data.days_ago(366)
+    buckets = rollups.weekly(user_dir, since) if grain == "Week" else rollups.monthly(user_dir, since)
+    periods, volumes = rollups.series(buckets, "volume", last=12)
+    if not periods:
+        return None
+    fig3 = px.bar(x=periods, y=volumes, labels={"x": grain.lower(), "y": "total_volume"},
+                  title=f"📦 {grain}ly Volume (kg lifted)", color_discrete_sequence=["#6366f1"])
+    fig3.update_layout(**CHART_LAYOUT, height=260)
+    return fig3
+
+
+def _radar_fig(rdf_last):
+    # The same parts, and the same formula version, as the stored recovery score.
+    parts = scores.recovery_parts(rdf_last.get("sleep_hours", 0), rdf_last.get("stress_level", 5),
+                                  rdf_last.get("energy_level", 0), rdf_last.get("resting_hr", 60))
+
+    fig4 = go.Figure(go.Scatterpolar(
+        r=[float(parts[p][0]) for p in ("sleep", "low_stress", "energy", "heart")],
+        theta=["Sleep Quality", "Low Stress", "Energy", "Heart Health"],
+        fill="toself", fillcolor="rgba(99,102,241,0.25)",
+        line_color="#6366f1", name="Recovery"
+    ))
+    fig4.update_layout(**CHART_LAYOUT, height=300, title="🔄 Recovery Radar",
+                       polar=dict(bgcolor="#13161f",
+                                  radialaxis=dict(visible=True, range=[0, 5], color="#7c8db5"),
+                                  angularaxis=dict(color="#7c8db5")))
+    return fig4
@@ -0,0 +1,85 @@
+"""
+🧬 Hormones — lifestyle factors behind hormone health.
+"""
+
+from datetime import date
+
+import plotly.express as px
+import streamlit as st
+
+import data
+import figures
+import scores
+from ui import CHART_LAYOUT
+
+# The score chart reads the stored daily scores; see scores.py.
+STREAMS = {"hormone": ["date", "daily_steps", "sunlight_min"]}
+
+
+def render():
+    st.markdown('<div class="section-header">🧬 Hormone Health Tracker</div>', unsafe_allow_html=True)
+    st.markdown("""<div style="background:#1a1d2e;border-radius:12px;padding:14px;margin-bottom:16px;font-size:0.85rem;color:#a5b4fc">
+    🧠 Tracking these lifestyle factors directly influences <strong>testosterone</strong>, <strong>cortisol</strong>,
+    <strong>insulin sensitivity</strong>, and <strong>circadian health</strong>.
+    </div>""", unsafe_allow_html=True)
+
+    with st.form("hormone_form"):
+        st.markdown('<div class="form-box">', unsafe_allow_html=True)
+        h_date = st.date_input("📅 Date", value=date.today())
+        c1, c2 = st.columns(2)
+        with c1:
+            h_sun    = st.number_input("☀️ Sunlight Exposure (min)", 0, 300, 30, 5)
+            h_steps  = st.number_input("👟 Daily Steps", 0, 40000, 8000, 100)
+            h_alcohol = st.selectbox("🍺 Alcohol", ["None", "1 drink", "2 drinks", "3+ drinks"])
+        with c2:
+            h_train  = st.selectbox("🏋️ Training Today", ["Yes – Intense", "Yes – Moderate", "Yes – Light", "No – Rest", "No – Sick"])
+            h_sleep_q = st.slider("😴 Sleep Quality", 1, 5, 4, help="1=Poor, 5=Excellent")
+            h_libido = st.slider("⚡ Energy/Drive", 1, 5, 3, help="Proxy for hormonal health")
+        h_notes = st.text_area("📝 Notes", placeholder="Cold exposure, fasting, mood…", height=70)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        if st.form_submit_button("💾 Save Hormone Log"):
+            h_health_score = scores.hormone(h_sun, h_steps, h_alcohol, h_train, h_sleep_q, h_libido)
+
+            entry = {
+                "date": str(h_date), "sunlight_min": h_sun, "daily_steps": h_steps,
+                "alcohol": h_alcohol, "training_status": h_train, "sleep_quality": h_sleep_q,
+                "energy_libido": h_libido, "hormone_health_score": h_health_score, "notes": h_notes
+            }
+            data.append("hormone", entry)
+            st.success(f"✅ Logged! Hormone Health Score: {h_health_score}/5.0")
+
+    since = data.days_ago(30)
+    hdf = data.to_df("hormone", columns=STREAMS["hormone"], since=since)
+    if not hdf.empty:
+        hdf = hdf.sort_values("date")
+
+        user_dir = data.get_user_dir()
+        figures.show("hormone", "hormones.score", lambda: _score_fig(user_dir, since), since)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            figures.show("hormone", "hormones.steps",
+                         lambda: _line_fig(hdf, "daily_steps", "👟 Daily Steps", "#fb923c"), since)
+        with col2:
+            figures.show("hormone", "hormones.sunlight",
+                         lambda: _line_fig(hdf, "sunlight_min", "☀️ Sunlight (min)", "#facc15"), since)
+    else:
+        st.info("No hormone health data yet!")
+
+
+def _score_fig(user_dir, since):
+    daily = scores.daily(user_dir, "hormone", date.fromisoformat(since))
+    if daily.empty:
+        return None
+    fig = px.area(daily, x="date", y="hormone_health_score",
+                  title="🧬 Hormone Health Score Trend (30d)",
+                  color_discrete_sequence=["#c084fc"])
+    fig.update_layout(**CHART_LAYOUT, height=300, yaxis_range=[0, 5])
+    return fig
+
+
+def _line_fig(hdf, col, title, color):
+    fig = px.line(hdf, x="date", y=col, title=title, color_discrete_sequence=[color])
+    fig.update_layout(**CHART_LAYOUT, height=250)
+    return fig
@@ -0,0 +1,59 @@
+"""
+📥 Import — bring in history from another tracker as CSV or JSON.
+"""
+
+import io
+
+import streamlit as st
+
+import data
+import importer
+
+# The page writes streams but renders none of them.
+STREAMS = {}
+
+LABELS = {
+    "workout": "🏋️ Workouts",
+    "body": "📏 Body Metrics",
+    "nutrition": "🥗 Nutrition",
+    "recovery": "😴 Recovery",
+}
+
+
+def render():
+    st.markdown('<div class="section-header">📥 Import History</div>', unsafe_allow_html=True)
+    key = st.selectbox("Data to import", list(LABELS), format_func=LABELS.get)
+    fields = importer.FIELDS[key]
+    required = importer.REQUIRED[key]
+    st.caption("Columns: " + ", ".join(f"**{f}**" if f in required else f for f in fields)
+               + " (bold = required, dates as YYYY-MM-DD; computed fields are filled in when missing)")
+    upload = st.file_uploader("CSV, JSON Lines or JSON array", type=[ext.lstrip(".") for ext in importer.FORMATS])
+    if upload is None or not st.button("📥 Import"):
+        return
+
+    try:
+        fmt = importer.detect_format(upload.name)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    bar = st.progress(0.0, text="Importing…")
+
+    def progress(report):
+        # Bytes consumed from the upload, since the row count is unknown up front.
+        bar.progress(min(upload.tell() / max(upload.size, 1), 1.0),
+                     text=f"{report['imported']:,} imported · {report['rejected']:,} rejected")
+
+    f = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    try:
+        report = data.import_file(key, f, fmt, progress)
+    except (ValueError, UnicodeDecodeError) as e:
+        st.error(f"Import stopped: {e}")
+        return
+    bar.progress(1.0, text="Done")
+    st.success(f"✅ Imported {report['imported']:,} of {report['read']:,} rows")
+    if report["prs"]:
+        st.info(f"🏆 {len(report['prs'])} PRs updated: {', '.join(report['prs'][:10])}")
+    if report["rejected"]:
+        st.warning(f"{report['rejected']:,} rows rejected")
+        st.dataframe([{"row": pos, "problem": msg} for pos, msg in report["errors"]],
+                     use_container_width=True, hide_index=True)
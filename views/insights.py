@@ -0,0 +1,110 @@
+"""
+🔗 Insights — how the streams move together, from the daily fact table.
+"""
+
+from datetime import date, timedelta
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import data
+import facts
+import figures
+import storage
+from ui import CHART_LAYOUT, card, range_picker
+
+# Everything is read from the fact table, which every stream writes into.
+STREAMS = {}
+
+HEATMAP = ["volume", "top_weight", "bodyweight", "calories", "protein", "sleep_hours", "stress_level",
+           "energy_level", "resting_hr", "recovery_score", "daily_steps", "alcohol_drinks",
+           facts.SUPPLEMENT_COLUMN]
+
+LABELS = {
+    "volume": "Volume (kg)", "top_weight": "Top weight (kg)", "bodyweight": "Bodyweight (kg)",
+    "calories": "Calories", "protein": "Protein (g)", "sleep_hours": "Sleep (h)", "stress_level": "Stress",
+    "energy_level": "Energy", "resting_hr": "Resting HR", "recovery_score": "Recovery score",
+    "daily_steps": "Steps", "alcohol_drinks": "Alcohol (drinks)", facts.SUPPLEMENT_COLUMN: "Supplements %",
+}
+
+
+def render():
+    st.markdown('<div class="section-header">🔗 Insights</div>', unsafe_allow_html=True)
+    user_dir = data.get_user_dir()
+
+    days = range_picker("insights_range")
+    until = date.today()
+    since = until - timedelta(days=(days or 3650) - 1)
+    c1, c2 = st.columns(2)
+    with c1:
+        target = st.selectbox("🎯 Outcome", ["volume"] + [facts.EXERCISE_PREFIX + ex for ex in facts.exercises(user_dir)]
+                              + [c for c in HEATMAP if c != "volume"], format_func=_label)
+    with c2:
+        lag = st.select_slider("⏱️ Compare with the day(s) before", [0, 1, 2, 3], value=1)
+
+    exercises = [target[len(facts.EXERCISE_PREFIX):]] if target.startswith(facts.EXERCISE_PREFIX) else []
+    df = facts.frame(user_dir, since, until, exercises)
+    if df[target].notna().sum() < 14:
+        st.info("Log at least two weeks of data to see what moves together.")
+        return
+
+    window = (since.isoformat(), target, lag)
+    streams = tuple(storage.STREAMS)
+    figures.show(streams, "insights.drivers", lambda: _drivers_fig(df, target, lag), window)
+    figures.show(streams, "insights.heatmap", lambda: _heatmap_fig(df), window[0])
+
+    st.markdown('<div class="section-header">🔍 Ask a question</div>', unsafe_allow_html=True)
+    options = [c for c in HEATMAP if c != target]
+    c1, c2 = st.columns(2)
+    with c1:
+        predictor = st.selectbox("When", options, format_func=_label,
+                                 index=options.index("sleep_hours") if "sleep_hours" in options else 0)
+    with c2:
+        threshold = st.number_input("is below", value=float(df[predictor].median()) if df[predictor].notna().any() else 0.0)
+    lagged = facts.lag(df[[predictor, target]], lag, [predictor]) if lag else df
+    by = f"{predictor}_lag{lag}" if lag else predictor
+    result = facts.split(lagged, by, threshold, target)
+    when = "the day before" if lag == 1 else f"{lag} days before" if lag else "the same day"
+    c1, c2 = st.columns(2)
+    for col, name, title, color in ((c1, "below", f"below {threshold:g}", "#f87171"),
+                                    (c2, "above", f"{threshold:g} or more", "#4ade80")):
+        mean, n = result[name]
+        with col:
+            card(f"{_label(target)} · {title}", f"{mean:,.1f}" if mean is not None else "—",
+                 f"({n} days)", color=color)
+    st.caption(f"{_label(predictor)} measured {when}.")
+
+
+def _label(column):
+    if column.startswith(facts.EXERCISE_PREFIX):
+        return f"{column[len(facts.EXERCISE_PREFIX):]} volume (kg)"
+    return LABELS.get(column, column)
+
+
+def _drivers_fig(df, target, lag):
+    predictors = [c for c in HEATMAP if c != target]
+    frame = df[predictors + [target]]
+    if lag:
+        frame = facts.lag(frame, lag, predictors).drop(columns=predictors)
+    r = facts.correlations(frame, target)
+    if r.empty:
+        return None
+    labels = [_label(c.rsplit("_lag", 1)[0] if lag else c) for c in r.index]
+    fig = go.Figure(go.Bar(x=r.values, y=labels, orientation="h",
+                           marker_color=["#4ade80" if v > 0 else "#f87171" for v in r.values]))
+    when = f" ({lag}d earlier)" if lag else ""
+    fig.update_layout(**CHART_LAYOUT, height=40 + 24 * len(r), title=f"📈 What goes with {_label(target)}{when}",
+                      xaxis_range=[-1, 1], yaxis_autorange="reversed")
+    return fig
+
+
+def _heatmap_fig(df):
+    corr = df[HEATMAP].corr(min_periods=14).dropna(how="all").dropna(axis=1, how="all")
+    if corr.empty:
+        return None
+    labels = [_label(c) for c in corr.columns]
+    fig = px.imshow(corr.values, x=labels, y=[_label(c) for c in corr.index], zmin=-1, zmax=1,
+                    color_continuous_scale="RdBu", text_auto=".2f", title="🧩 Same-day correlations")
+    fig.update_layout(**CHART_LAYOUT, height=560)
+    return fig
@@ -0,0 +1,170 @@
+"""
+🥗 Nutrition — calories, macros and water.
+"""
+
+from datetime import date
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import data
+import figures
+import rollups
+import targets
+import trends
+from ui import CHART_LAYOUT, card
+
+STREAMS = {"nutrition": ["date", "calories", "protein", "carbs", "fats", "water_l"]}
+
+
+def render():
+    st.markdown('<div class="section-header">🥗 Nutrition Log</div>', unsafe_allow_html=True)
+
+    with st.form("nutrition_form"):
+        st.markdown('<div class="form-box">', unsafe_allow_html=True)
+        n_date = st.date_input("📅 Date", value=date.today())
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            n_cal   = st.number_input("🔥 Calories (kcal)", 0, 10000, 2500, 50)
+            n_prot  = st.number_input("🥩 Protein (g)", 0, 500, 180, 5)
+        with c2:
+            n_carbs = st.number_input("🍞 Carbs (g)", 0, 1000, 250, 5)
+            n_fats  = st.number_input("🥑 Fats (g)", 0, 300, 70, 5)
+        with c3:
+            n_water = st.number_input("💧 Water (L)", 0.0, 10.0, 3.0, 0.1)
+            n_fiber = st.number_input("🌾 Fiber (g)", 0, 100, 30, 1)
+        n_notes = st.text_area("📝 Notes", placeholder="Meal quality, hunger, cravings…", height=70)
+        st.markdown('</div>', unsafe_allow_html=True)
+        if st.form_submit_button("💾 Save Nutrition"):
+            est_cal = round(n_prot * 4 + n_carbs * 4 + n_fats * 9)
+            entry = {
+                "date": str(n_date), "calories": n_cal, "protein": n_prot,
+                "carbs": n_carbs, "fats": n_fats, "water_l": n_water,
+                "fiber": n_fiber, "est_calories_from_macros": est_cal, "notes": n_notes
+            }
+            data.append("nutrition", entry)
+            st.success(f"✅ Saved! Est. cals from macros: {est_cal} kcal")
+
+    user_dir = data.get_user_dir()
+    ndf = data.to_df("nutrition", columns=STREAMS["nutrition"])
+    if not ndf.empty:
+        ndf = ndf.sort_values("date")
+
+        # Macro pie latest
+        latest_n = ndf.iloc[-1]
+        col_l, col_r = st.columns(2)
+        with col_l:
+            if all(c in latest_n for c in ["protein","carbs","fats"]):
+                figures.show("nutrition", "nutrition.macros", lambda: _macro_fig(latest_n))
+        with col_r:
+            # Latest logged day against that day's targets (see targets.py), not the form's values.
+            summary = targets.summary(user_dir)
+            if summary["latest"] is not None:
+                row = summary["latest"]
+                st.caption(f"🎯 Targets for {summary['date']}" + (" · training day" if row["training"] else ""))
+                for label, m, fmt in (("Calories", "calories", "{:,.0f}"), ("Protein (g)", "protein", "{:,.0f}"),
+                                      ("Water (L)", "water", "{:,.1f}")):
+                    val, target, pct = row[m], row[f"{m}_target"], row[f"{m}_pct"]
+                    if val != val:
+                        continue
+                    # The adherence score, so eating over the calorie target shortens the bar too.
+                    pct = int(pct) if pct == pct else 100
+                    color = "#4ade80" if pct >= 90 else "#facc15" if pct >= 70 else "#f87171"
+                    st.markdown(f"""
+                    <div style="margin-bottom:12px">
+                        <div style="display:flex;justify-content:space-between;margin-bottom:4px">
+                            <span style="font-size:0.85rem">{label}</span>
+                            <span style="font-size:0.85rem;color:#7c8db5">{fmt.format(val)} / {fmt.format(target)}</span>
+                        </div>
+                        <div style="background:#1a1d2e;border-radius:999px;height:10px">
+                            <div style="background:{color};width:{pct}%;height:10px;border-radius:999px;transition:width 0.5s"></div>
+                        </div>
+                    </div>""", unsafe_allow_html=True)
+
+        st.markdown("**🎯 Adherence**")
+        adh_cols = st.columns(3)
+        for col, (name, title) in zip(adh_cols, (("day", "Day"), ("week", "This week"), ("month", "This month"))):
+            period = summary[name]
+            with col:
+                if period is None:
+                    card(title, "–", "%")
+                else:
+                    color = "#4ade80" if period["adherence"] >= 90 else "#facc15" if period["adherence"] >= 70 else "#f87171"
+                    card(title, f"{period['adherence']:.0f}", "%", color=color)
+                    st.caption(f"{period['on_target']}/{period['days']} days on target · "
+                               f"kcal {period['calories']:.0f}% · protein {period['protein']:.0f}% · water {period['water']:.0f}%")
+        _goals_form(user_dir)
+
+        # Trend
+        since = data.days_ago(30)
+        figures.show("nutrition", "nutrition.trend", lambda: _trend_fig(user_dir, since), since)
+
+        # Average stats
+        st.markdown("**📊 7-Day Averages**")
+        week = ndf.tail(7)
+        avg_cols = st.columns(4)
+        for i, (m, u, c) in enumerate([("calories","kcal","#f87171"),("protein","g","#4ade80"),
+                                        ("carbs","g","#38bdf8"),("fats","g","#fb923c")]):
+            if m in week.columns:
+                avg_cols[i].metric(f"{m.title()}", f"{week[m].mean():.0f} {u}")
+        line = trends.caption(user_dir, "nutrition", "calories", "kcal")
+        if line:
+            st.caption(f"🔥 Calories: {line}")
+    else:
+        st.info("No nutrition data yet!")
+
+
+def _goals_form(user_dir):
+    goals = targets.current(user_dir)
+    with st.expander("⚙️ Targets"):
+        st.caption("Calories and protein follow your bodyweight trend; training days get extra calories "
+                   "and water. Changes apply from the chosen date on, earlier days keep their targets.")
+        with st.form("targets_form"):
+            c1, c2 = st.columns(2)
+            with c1:
+                goal = st.selectbox("Goal", list(targets.GOALS), index=list(targets.GOALS).index(goals["goal"]))
+                kcal = st.number_input("kcal per kg (maintenance)", 20.0, 50.0, float(goals["kcal_per_kg"]), 0.5)
+                prot = st.number_input("Protein g per kg", 0.8, 4.0, float(goals["protein_per_kg"]), 0.1)
+                start = st.date_input("Starting", value=date.today())
+            with c2:
+                train = st.number_input("Extra kcal on training days", 0.0, 1500.0, float(goals["training_kcal"]), 50.0)
+                # Clamped, so goals saved before the minimums existed still load into the form.
+                water = st.number_input("💧 Water (L)", 0.5, 10.0, max(float(goals["water_l"]), 0.5), 0.1)
+                cal = st.number_input("Calories before any bodyweight", 500.0, 10000.0,
+                                      max(float(goals["calories"]), 500.0), 50.0)
+                protein = st.number_input("Protein before any bodyweight", 10.0, 500.0,
+                                          max(float(goals["protein"]), 10.0), 5.0)
+            if st.form_submit_button("💾 Save targets"):
+                targets.set_goals(user_dir, start, goal=goal, kcal_per_kg=kcal, protein_per_kg=prot,
+                                  training_kcal=train, water_l=water, calories=cal, protein=protein)
+                st.rerun()
+
+
+def _macro_fig(latest_n):
+    fig = go.Figure(go.Pie(
+        labels=["Protein","Carbs","Fats"],
+        values=[latest_n["protein"]*4, latest_n["carbs"]*4, latest_n["fats"]*9],
+        hole=0.5,
+        marker_colors=["#4ade80","#38bdf8","#fb923c"]
+    ))
+    fig.update_layout(**CHART_LAYOUT, height=280, title="🥧 Latest Macro Split (kcal)")
+    return fig
+
+
+def _trend_fig(user_dir, since):
+    daily = rollups.frame(rollups.daily(user_dir, since), ["calories", "protein"])
+    if daily.empty:
+        return None
+    daily.index = pd.to_datetime(daily.index)
+    fig2 = px.line(daily, x=daily.index, y=["calories","protein"],
+                   title="📈 Nutrition Trends (last 30 days)",
+                   color_discrete_sequence=["#f87171","#4ade80"])
+    fig2.update_traces(opacity=0.5)
+    for m, c in (("calories", "#f87171"), ("protein", "#4ade80")):
+        trend = trends.frame(user_dir, "nutrition", m, since)
+        fig2.add_scatter(x=trend["date"], y=trend[m], mode="lines", name=f"{m} trend",
+                         line=dict(color=c, width=3, dash="dot"))
+    fig2.update_layout(**CHART_LAYOUT, height=300)
+    return fig2
@@ -0,0 +1,115 @@
+"""
+🏆 PRs — personal records, auto-tracked from logged sets.
+"""
+
+from datetime import date
+
+import plotly.express as px
+import streamlit as st
+
+import analytics
+import data
+import figures
+import pr_index
+from ui import CHART_LAYOUT, card
+
+# PRs come from the pr_index sidecar; the load charts read the workout log.
+STREAMS = {"workout": ["date", "exercise", "weight", "reps", "volume"]}
+
+
+def render():
+    st.markdown('<div class="section-header">🏆 Personal Records</div>', unsafe_allow_html=True)
+    # Already ordered heaviest first by the PR index
+    prs = data.pr_index()
+    ranked = pr_index.ranked(prs)
+    if ranked:
+        for row in ranked:
+            st.markdown(f"""
+            <div class="pr-badge">
+                <div>
+                    <div class="ex">🏋️ {row['exercise']}</div>
+                    <div style="font-size:0.75rem;color:#a78bfa">📅 {row.get('date','—')}</div>
+                </div>
+                <div class="stats">
+                    <div style="font-size:1.2rem;font-weight:800">{row['best_weight']} kg</div>
+                    <div>× {row['best_reps']} reps</div>
+                    <div style="font-size:0.75rem">e1RM {row['best_e1rm']} kg · best set {row['best_volume']:.0f} kg</div>
+                </div>
+            </div>""", unsafe_allow_html=True)
+
+        # Bar chart (the index changes with workout and PR writes)
+        figures.show(("workout", "pr"), "prs.top", lambda: _top_fig(ranked[:15]))
+
+        # Manual PR entry
+        st.markdown('<div class="section-header">➕ Add / Update PR</div>', unsafe_allow_html=True)
+        with st.form("pr_form"):
+            pc1, pc2, pc3, pc4 = st.columns(4)
+            pr_ex = pc1.text_input("Exercise")
+            pr_w  = pc2.number_input("Best Weight (kg)", min_value=0.0, step=2.5)
+            pr_r  = pc3.number_input("Best Reps", min_value=1, max_value=100, value=1)
+            pr_d  = pc4.date_input("Date", value=date.today())
+            if st.form_submit_button("💾 Save PR"):
+                if pr_ex:
+                    data.append("pr", {"exercise": pr_ex, "best_weight": pr_w, "best_reps": pr_r, "date": str(pr_d),
+                                       "source": "manual"})
+                    st.success(f"✅ PR saved for {pr_ex}")
+                    st.rerun()
+        _training_load()
+    else:
+        st.info("No PRs yet. Log workouts and PRs are auto-tracked!")
+
+
+def _training_load():
+    st.markdown('<div class="section-header">📈 Training Load</div>', unsafe_allow_html=True)
+    status = analytics.load_status(data.get_user_dir())
+    lo, hi = analytics.ACWR_SAFE
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        ratio = status["acwr"]
+        color = "#4ade80" if ratio is not None and lo <= ratio <= hi else "#fb923c"
+        card("⚖️ Acute:Chronic", ratio if ratio is not None else "–", "", color=color)
+    with c2:
+        card("🔁 Monotony (7d)", status["monotony"] if status["monotony"] is not None else "–", "", color="#a78bfa")
+    with c3:
+        card("📦 Avg Daily Load (7d)", f"{status['acute']:,.0f}", "kg", color="#6366f1")
+    figures.show("workout", "prs.muscle_volume", _muscle_volume_fig)
+    figures.show("workout", "prs.acwr", _acwr_fig, date.today().isoformat())
+
+
+def _muscle_volume_fig():
+    wdf = data.to_df("workout", columns=STREAMS["workout"])
+    if wdf.empty or "volume" not in wdf:
+        return None
+    weekly = analytics.weekly_group_volume(wdf).tail(12)
+    fig = px.bar(weekly, x=weekly.index, y=list(weekly.columns),
+                 title="💪 Weekly Volume by Muscle Group (kg)", labels={"x": "week", "value": "volume"})
+    fig.update_layout(**CHART_LAYOUT, height=320)
+    return fig
+
+
+def _acwr_fig():
+    wdf = data.to_df("workout", columns=STREAMS["workout"])
+    if wdf.empty or "volume" not in wdf:
+        return None
+    ratio = analytics.acwr(analytics.daily_load(wdf, until=date.today())).dropna().tail(90)
+    if ratio.empty:
+        return None
+    lo, hi = analytics.ACWR_SAFE
+    fig = px.line(x=ratio.index, y=ratio.to_numpy(), title="⚖️ Acute:Chronic Workload (90 days)",
+                  labels={"x": "date", "y": "ACWR"}, color_discrete_sequence=["#6366f1"])
+    fig.add_hrect(y0=lo, y1=hi, fillcolor="#4ade80", opacity=0.1, line_width=0)
+    fig.update_layout(**CHART_LAYOUT, height=280)
+    return fig
+
+
+def _top_fig(top):
+    weights = [r["best_weight"] for r in top]
+    fig = px.bar(x=[r["exercise"] for r in top], y=weights,
+                 title="🏆 Top PRs by Weight",
+                 color=weights, color_continuous_scale="Viridis",
+                 text=weights, labels={"x": "exercise", "y": "best_weight"})
+    fig.update_traces(texttemplate="%{text}kg", textposition="outside")
+    fig.update_layout(**CHART_LAYOUT, height=400, showlegend=False,
+                      coloraxis_showscale=False)
+    fig.update_layout(xaxis=dict(tickangle=-30))
+    return fig
@@ -0,0 +1,107 @@
+"""
+😴 Recovery — sleep, stress, energy and resting heart rate.
+"""
+
+from datetime import date
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.subplots import make_subplots
+
+import data
+import downsample
+import figures
+import scores
+import trends
+from ui import CHART_LAYOUT, range_picker
+
+STREAMS = {"recovery": ["date", "sleep_hours", "stress_level", "energy_level", "resting_hr", "recovery_score"]}
+
+MAX_POINTS = 400
+
+
+def render():
+    st.markdown('<div class="section-header">😴 Recovery System</div>', unsafe_allow_html=True)
+
+    with st.form("recovery_form"):
+        st.markdown('<div class="form-box">', unsafe_allow_html=True)
+        r_date = st.date_input("📅 Date", value=date.today())
+        c1, c2 = st.columns(2)
+        with c1:
+            r_sleep  = st.number_input("😴 Sleep Hours", 0.0, 14.0, 7.5, 0.5)
+            r_rhr    = st.number_input("❤️ Resting HR (bpm)", 30, 120, 58)
+        with c2:
+            r_stress = st.slider("🧠 Stress Level", 1, 5, 2, help="1=Low, 5=Very High")
+            r_energy = st.slider("⚡ Energy Level", 1, 5, 3, help="1=Exhausted, 5=Peak")
+        r_notes = st.text_area("📝 Notes", placeholder="Soreness, mood, sickness…", height=70)
+        st.markdown('</div>', unsafe_allow_html=True)
+        if st.form_submit_button("💾 Save Recovery"):
+            rec_score = scores.recovery(r_sleep, r_stress, r_energy, r_rhr)
+            entry = {
+                "date": str(r_date), "sleep_hours": r_sleep,
+                "stress_level": r_stress, "energy_level": r_energy,
+                "resting_hr": r_rhr, "recovery_score": rec_score, "notes": r_notes
+            }
+            data.append("recovery", entry)
+            color = "green" if rec_score >= 4 else "orange" if rec_score >= 3 else "red"
+            st.markdown(f"""<div style="background:#13161f;border:1px solid #2a2d3e;border-radius:12px;padding:16px;text-align:center">
+                <div style="font-size:0.85rem;color:#7c8db5">Recovery Score</div>
+                <div style="font-size:3rem;font-weight:900;color:{color}">{rec_score}</div>
+                <div style="font-size:0.8rem;color:#7c8db5">out of 5.0</div>
+            </div>""", unsafe_allow_html=True)
+
+    rdf = data.to_df("recovery", columns=STREAMS["recovery"])
+    if not rdf.empty:
+        rdf = rdf.sort_values("date")
+
+        days = range_picker("recovery_range")
+        since = data.days_ago(days) if days else None
+        mdf = rdf if since is None else rdf[rdf["date"] >= since]
+        user_dir = data.get_user_dir()
+        figures.show("recovery", "recovery.metrics", lambda: _metrics_fig(mdf, user_dir, since), since)
+
+        # Recovery score timeline
+        since = data.days_ago(30)
+        figures.show("recovery", "recovery.score", lambda: _score_fig(user_dir, since), since)
+        for metric, label, unit in (("recovery_score", "🔄 Recovery score", "/5"), ("sleep_hours", "😴 Sleep", "h"),
+                                    ("resting_hr", "❤️ Resting HR", "bpm")):
+            line = trends.caption(user_dir, "recovery", metric, unit)
+            if line:
+                st.caption(f"{label}: {line}")
+    else:
+        st.info("No recovery data yet!")
+
+
+def _metrics_fig(rdf, user_dir, since):
+    fig = make_subplots(rows=2, cols=2,
+                        subplot_titles=["😴 Sleep (hrs)","⚡ Energy (1-5)","🧠 Stress (1-5)","❤️ Resting HR"])
+    pairs = [("sleep_hours","#38bdf8",1,1), ("energy_level","#facc15",1,2),
+             ("stress_level","#f87171",2,1), ("resting_hr","#f97316",2,2)]
+    for m, c_, r, col_ in pairs:
+        if m in rdf.columns:
+            pts = downsample.points(rdf, "date", m, MAX_POINTS)
+            fig.add_trace(go.Scatter(x=pts["date"], y=pts[m],
+                                      mode="lines+markers", line_color=c_, line_width=2,
+                                      marker_size=5, name=m), row=r, col=col_)
+            if m in trends.METRICS["recovery"]:
+                trend = downsample.points(trends.frame(user_dir, "recovery", m, since), "date", m, MAX_POINTS)
+                fig.add_trace(go.Scatter(x=trend["date"], y=trend[m], mode="lines", name=f"{m} trend",
+                                         line=dict(color="#e8eaf0", width=2, dash="dot")), row=r, col=col_)
+    fig.update_layout(**CHART_LAYOUT, height=500, showlegend=False)
+    return fig
+
+
+def _score_fig(user_dir, since):
+    daily = scores.daily(user_dir, "recovery", date.fromisoformat(since))
+    if daily.empty:
+        return None
+    fig2 = px.bar(daily, x="date", y="recovery_score",
+                  title="🔄 Recovery Score (last 30 days)",
+                  color="recovery_score", color_continuous_scale=["#f87171","#facc15","#4ade80"],
+                  range_color=[1, 5])
+    trend = trends.frame(user_dir, "recovery", "recovery_score", since)
+    fig2.add_scatter(x=trend["date"], y=trend["recovery_score"], mode="lines", name="trend",
+                     line=dict(color="#e8eaf0", width=2.5))
+    fig2.update_layout(**CHART_LAYOUT, height=250, coloraxis_showscale=False)
+    return fig2
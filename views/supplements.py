@@ -0,0 +1,92 @@
+"""
+💊 Supplements — daily checklist and compliance.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+import compliance
+import data
+import figures
+from ui import CHART_LAYOUT, COLORS, range_picker
+
+# Compliance charts read the per-day bitmask sidecars, not the stream.
+STREAMS = {}
+
+
+def render():
+    st.markdown('<div class="section-header">💊 Supplement Tracker</div>', unsafe_allow_html=True)
+    user_dir = data.get_user_dir()
+    items = compliance.active(user_dir)
+
+    with st.form("supp_form"):
+        st.markdown('<div class="form-box">', unsafe_allow_html=True)
+        s_date = st.date_input("📅 Date", value=date.today())
+        st.markdown("**Mark taken today:**")
+        cols_ = st.columns(min(len(items), 5) or 1)
+        checks = {}
+        for i, s in enumerate(items):
+            checks[s["key"]] = cols_[i % len(cols_)].checkbox(s["label"].split(" ", 1)[1], value=True)
+        s_notes = st.text_input("📝 Notes", placeholder="Timing, missed dose reason…")
+        st.markdown('</div>', unsafe_allow_html=True)
+        if st.form_submit_button("💾 Log Supplements"):
+            entry = {"date": str(s_date), "notes": s_notes, **checks}
+            data.append("supplement", entry)
+            taken = sum(checks.values())
+            st.success(f"✅ Logged! {taken}/{len(checks)} supplements taken")
+
+    with st.expander("⚙️ Manage supplements"):
+        c1, c2 = st.columns(2)
+        with c1:
+            new = st.text_input("Add a supplement", placeholder="e.g. Ashwagandha")
+            if st.button("➕ Add") and new.strip():
+                try:
+                    compliance.add(user_dir, new)
+                    st.rerun()
+                except ValueError as e:
+                    st.error(str(e))
+        with c2:
+            drop = st.selectbox("Stop tracking", [s["key"] for s in items],
+                                format_func=lambda k: next(s["label"] for s in items if s["key"] == k))
+            if st.button("➖ Remove") and drop:
+                compliance.remove(user_dir, drop)
+                st.rerun()
+
+    days = range_picker("supplement_range") or 3650
+    since = date.today() - timedelta(days=days - 1)
+    dates, taken, tracked = compliance.window(user_dir, since)
+    if (taken != compliance.NOT_LOGGED).any():
+        window = (since.isoformat(), tuple(s["key"] for s in items))
+        figures.show("supplement", "supplements.daily", lambda: _daily_fig(dates, taken, tracked), window)
+        figures.show("supplement", "supplements.per_supp",
+                     lambda: _per_supp_fig(taken, tracked, user_dir, days), window)
+    else:
+        st.info("No supplement data yet!")
+
+
+def _daily_fig(dates, taken, tracked):
+    pct = compliance.daily(taken, tracked)
+    logged = ~np.isnan(pct)
+    fig = px.bar(x=dates[logged], y=pct[logged],
+                 title="💊 Daily Supplement Compliance (%)",
+                 color=pct[logged], color_continuous_scale=["#f87171","#facc15","#4ade80"],
+                 range_color=[0, 100], labels={"x": "date", "y": "compliance_pct"})
+    fig.update_layout(**CHART_LAYOUT, height=280, coloraxis_showscale=False)
+    return fig
+
+
+def _per_supp_fig(taken, tracked, user_dir, days):
+    comp_data = compliance.per_supplement(taken, tracked, compliance.supplements(user_dir))
+    fig2 = go.Figure(go.Bar(
+        x=list(comp_data.values()), y=list(comp_data.keys()),
+        orientation="h", marker_color=[COLORS[i % len(COLORS)] for i in range(len(comp_data))],
+        text=[f"{v:.0f}%" for v in comp_data.values()], textposition="outside"
+    ))
+    span = "all time" if days >= 3650 else f"{days}d"
+    fig2.update_layout(**CHART_LAYOUT, height=280, title=f"📊 Per-Supplement Compliance ({span})",
+                       xaxis_range=[0, 110])
+    return fig2
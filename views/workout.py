@@ -0,0 +1,177 @@
+"""
+🏋️ Workout — log sets and browse per-exercise history.
+"""
+
+from datetime import date
+
+import plotly.express as px
+import streamlit as st
+
+import data
+import downsample
+import figures
+from ui import CHART_LAYOUT, range_picker
+
+STREAMS = {"workout": None}
+
+MAX_POINTS = 300
+
+TRAINING_DAYS = ["Upper A", "Upper B", "Lower A", "Lower B", "Push", "Pull", "Legs", "Full Body", "Recovery / Mobility", "Cardio", "Rest"]
+EXERCISES = [
+    "Bench Press", "Incline Bench", "OHP", "Dumbbell Press", "Cable Fly", "Chest Dip",
+    "Pull-Up", "Barbell Row", "Cable Row", "Lat Pulldown", "Face Pull",
+    "Squat", "Romanian Deadlift", "Leg Press", "Leg Curl", "Leg Extension", "Calf Raise",
+    "Deadlift", "Hip Thrust", "Plank", "Ab Wheel", "Lateral Raise", "Curl", "Tricep Pushdown",
+    "Other"
+]
+
+
+def render():
+    st.markdown('<div class="section-header">🏋️ Log Workout</div>', unsafe_allow_html=True)
+    mode = st.radio("Mode", ["Single entry", "Session"], horizontal=True, key="workout_mode",
+                    help="Session mode buffers a whole training day and saves it in one write")
+    if mode == "Session":
+        _session_logger()
+    else:
+        _single_form()
+    _history()
+
+
+def _single_form():
+    with st.form("workout_form"):
+        st.markdown('<div class="form-box">', unsafe_allow_html=True)
+        c1, c2 = st.columns(2)
+        with c1:
+            w_date    = st.date_input("📅 Date", value=date.today())
+            w_day     = st.selectbox("💪 Training Day", TRAINING_DAYS)
+        with c2:
+            w_ex      = st.selectbox("🏋️ Exercise", EXERCISES)
+            w_ex_custom = st.text_input("Or type custom exercise", placeholder="e.g. Nordic Curl")
+
+        c3, c4, c5, c6 = st.columns(4)
+        with c3: w_sets   = st.number_input("Sets",   min_value=1, max_value=20, value=3)
+        with c4: w_reps   = st.number_input("Reps",   min_value=1, max_value=100, value=10)
+        with c5: w_weight = st.number_input("Weight (kg)", min_value=0.0, max_value=500.0, value=60.0, step=2.5)
+        with c6:
+            volume = round(w_sets * w_reps * w_weight, 1)
+            st.metric("📦 Volume", f"{volume} kg")
+
+        w_notes = st.text_area("📝 Notes", placeholder="RPE, fatigue, form cues…", height=80)
+        st.markdown('</div>', unsafe_allow_html=True)
+        submitted = st.form_submit_button("💾 Save Set")
+
+    if submitted:
+        exercise = w_ex_custom.strip() if w_ex_custom.strip() else w_ex
+        entry = {
+            "date": str(w_date), "training_day": w_day, "exercise": exercise,
+            "sets": int(w_sets), "reps": int(w_reps), "weight": float(w_weight),
+            "volume": volume, "notes": w_notes
+        }
+        # The PR index is updated by the same write
+        if data.append("workout", entry)["prs"]:
+            st.balloons()
+            st.success("🏆 NEW PR! Auto-saved to PR Tracker!")
+        st.success(f"✅ Saved: {exercise} — {w_sets}×{w_reps} @ {w_weight}kg (Vol: {volume}kg)")
+
+
+def _buffer():
+    if "workout_session" not in st.session_state:
+        st.session_state.workout_session = []
+    return st.session_state.workout_session
+
+
+def _session_logger():
+    # Sets stay in session state until "Finish", so adding one never writes to disk.
+    sets = _buffer()
+    saved = st.session_state.pop("workout_saved", None)
+    if saved:
+        prs, n, total = saved
+        if prs:
+            st.balloons()
+            st.success(f"🏆 NEW PR: {', '.join(prs)}")
+        st.success(f"✅ Session saved: {n} sets · {total:,.0f} kg")
+    c1, c2 = st.columns(2)
+    with c1: s_date = st.date_input("📅 Date", value=date.today(), key="session_date")
+    with c2: s_day  = st.selectbox("💪 Training Day", TRAINING_DAYS, key="session_day")
+
+    last = sets[-1] if sets else {"exercise": EXERCISES[0], "reps": 10, "weight": 60.0, "rpe": 8.0}
+    with st.form("session_set_form", clear_on_submit=False):
+        c1, c2 = st.columns(2)
+        with c1:
+            s_ex = st.selectbox("🏋️ Exercise", EXERCISES,
+                                index=EXERCISES.index(last["exercise"]) if last["exercise"] in EXERCISES else 0)
+        with c2:
+            s_ex_custom = st.text_input("Or type custom exercise",
+                                        value="" if last["exercise"] in EXERCISES else last["exercise"])
+        c3, c4, c5 = st.columns(3)
+        with c3: s_reps   = st.number_input("Reps", min_value=1, max_value=100, value=int(last["reps"]))
+        with c4: s_weight = st.number_input("Weight (kg)", min_value=0.0, max_value=500.0,
+                                            value=float(last["weight"]), step=2.5)
+        with c5: s_rpe    = st.number_input("RPE", min_value=1.0, max_value=10.0,
+                                            value=float(last["rpe"] or 8.0), step=0.5)
+        if st.form_submit_button("➕ Add Set"):
+            exercise = s_ex_custom.strip() or s_ex
+            sets.append({"exercise": exercise, "reps": int(s_reps), "weight": float(s_weight), "rpe": float(s_rpe)})
+            st.rerun()
+
+    if not sets:
+        st.info("Add the sets of today's session; nothing is saved until you finish.")
+        return
+    st.dataframe([{"#": i + 1, **s, "volume": round(s["reps"] * s["weight"], 1)} for i, s in enumerate(sets)],
+                 use_container_width=True, hide_index=True)
+    total = sum(s["reps"] * s["weight"] for s in sets)
+    s_notes = st.text_input("📝 Session notes", key="session_notes")
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        if st.button(f"💾 Finish Session ({len(sets)} sets · {total:,.0f} kg)", type="primary"):
+            entries = [{
+                "date": str(s_date), "training_day": s_day, "exercise": s["exercise"],
+                "sets": 1, "reps": s["reps"], "weight": s["weight"], "rpe": s["rpe"],
+                "volume": round(s["reps"] * s["weight"], 1), "notes": s_notes,
+            } for s in sets]
+            # One append for the whole session; PRs are evaluated once over all of it.
+            prs = data.append("workout", *entries)["prs"]
+            sets.clear()
+            st.session_state.workout_saved = (list(dict.fromkeys(prs)), len(entries), total)
+            st.rerun()
+    with c2:
+        if st.button("↩️ Remove Last Set"):
+            sets.pop()
+            st.rerun()
+    with c3:
+        if st.button("🗑️ Discard Session"):
+            sets.clear()
+            st.rerun()
+
+
+def _history():
+    st.markdown('<div class="section-header">📋 Workout History</div>', unsafe_allow_html=True)
+    df_all = data.to_df("workout")
+    # Names from the cached frame; the log itself is not re-read on a rerun.
+    user_exercises = sorted(df_all["exercise"].dropna().unique()) if "exercise" in df_all else []
+    if user_exercises:
+        # Filter by exercise
+        sel = st.selectbox("Filter by exercise", ["All"] + user_exercises)
+        df_show = df_all if sel == "All" else data.to_df("workout", exercise=sel)
+
+        st.dataframe(df_show.sort_values("date", ascending=False).head(50),
+                     use_container_width=True, hide_index=True)
+
+        if sel != "All":
+            days = range_picker("workout_range")
+            since = data.days_ago(days) if days else None
+            pdf = df_show if since is None else df_show[df_show["date"] >= since]
+            figures.show("workout", "workout.progression", lambda: _progression_fig(pdf, sel), (sel, since))
+    else:
+        st.info("No workouts logged yet. Add your first one above!")
+
+
+def _progression_fig(df_show, exercise):
+    pts = downsample.points(df_show.sort_values("date"), "date", "weight", MAX_POINTS)
+    fig = px.line(pts, x="date", y="weight",
+                  title=f"📈 {exercise} — Weight Progression",
+                  color_discrete_sequence=["#6366f1"])
+    fig.update_traces(mode="lines+markers", line_width=2.5, marker_size=6)
+    fig.update_layout(**CHART_LAYOUT, height=300)
+    return fig